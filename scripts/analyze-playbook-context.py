@@ -12,25 +12,117 @@ Usage:
 """
 
 import argparse
+import hashlib
+import io
 import json
 import logging
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from itertools import chain
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Set
+from typing import Dict, List, Any, Optional, Set, Tuple
 import re
-
-from playbook_utils import setup_logger, load_metadata
+import shutil
+import time
+
+from playbook_utils import TIER_PRIORITY, setup_logger, load_metadata
+
+# Cached output lives in the git dir so it never shows up in `git status`
+CACHE_FILENAME = "playbook-context-cache.json"
+CACHE_TTL_SECONDS = 60
+
+# Changed-file classification by case-sensitive suffix (one endswith call each)
+SOURCE_SUFFIXES = (".py", ".ts", ".tsx", ".js", ".jsx", ".go", ".rs")
+CONFIG_SUFFIXES = (
+    "Dockerfile",
+    "docker-compose.yml",
+    "package.json",
+    "pyproject.toml",
+    "setup.py",
+    "go.mod",
+)
+
+# Static per-phase recommendations; _generate_recommendations copies from here
+PHASE_RECOMMENDATIONS: Dict[str, Tuple[Dict[str, Any], ...]] = {
+    "START": (
+        {
+            "command": "pb-start",
+            "reason": "Beginning feature work on new branch",
+            "confidence": 0.95,
+        },
+    ),
+    "DEVELOP": (
+        {
+            "command": "pb-cycle",
+            "reason": "Iterate on changes, get peer feedback",
+            "confidence": 0.90,
+        },
+        {
+            "command": "pb-testing",
+            "reason": "Verify test coverage matches code changes",
+            "confidence": 0.85,
+        },
+    ),
+    "FINALIZE": (
+        {
+            "command": "pb-commit",
+            "reason": "Organize work into logical commits",
+            "confidence": 0.90,
+        },
+        {
+            "command": "pb-pr",
+            "reason": "Create pull request for integration",
+            "confidence": 0.90,
+        },
+    ),
+    "REVIEW": (
+        {
+            "command": "pb-review-code",
+            "reason": "Review code logic and patterns",
+            "confidence": 0.95,
+        },
+        {
+            "command": "pb-review-tests",
+            "reason": "Verify test coverage and quality",
+            "confidence": 0.85,
+        },
+        {
+            "command": "pb-security",
+            "reason": "Check security implications",
+            "confidence": 0.75,
+        },
+    ),
+    "RELEASE": (
+        {
+            "command": "pb-release",
+            "reason": "Prepare for production release",
+            "confidence": 0.90,
+        },
+        {
+            "command": "pb-deployment",
+            "reason": "Plan deployment strategy",
+            "confidence": 0.80,
+        },
+    ),
+}
 
 
 class PlaybookContextAnalyzer:
     """Analyze user context and recommend playbook commands."""
 
-    def __init__(self, metadata_file: Path = None, verbose: bool = False):
-        """Initialize analyzer."""
+    # Parsed metadata keyed by (resolved path, mtime_ns, size); shared by instances
+    _metadata_cache: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+
+    def __init__(self, metadata_file: Path = None, verbose: bool = False, cache: bool = False):
+        """Initialize analyzer. With cache=True, repeat runs reuse recent output."""
         self.metadata_file = metadata_file or Path(".playbook-metadata.json")
+        self.cache = cache
         self.logger = setup_logger("context-analyzer", verbose)
+        # Resolve git once so each call skips the PATH search
+        self._git = shutil.which("git") or "git"
         self.metadata = {}
         self.commands = {}
         self.recommendations: List[Dict[str, Any]] = []
@@ -43,8 +135,17 @@ class PlaybookContextAnalyzer:
         if not self.load_metadata():
             return self._format_error_state()
 
+        # Reuse recent output when HEAD, worktree and metadata are unchanged
+        status = cache_file = cache_key = None
+        if self.cache:
+            status, cache_file, cache_key = self._cache_lookup_key()
+            cached = self._read_cache(cache_file, cache_key)
+            if cached is not None:
+                self.logger.debug("Using cached analysis")
+                return cached
+
         # Analyze git state
-        git_state = self._analyze_git_state()
+        git_state = self._analyze_git_state(status)
         if not git_state:
             return self._format_error_state()
 
@@ -59,11 +160,26 @@ class PlaybookContextAnalyzer:
         self.recommendations = self._score_and_rank(recommendations, git_state)
 
         # Format and return output
-        return self._format_output(git_state, phase, file_types)
+        output = self._format_output(git_state, phase, file_types)
+        if cache_key:
+            self._write_cache(cache_file, cache_key, output)
+        return output
 
     def load_metadata(self) -> bool:
-        """Load extracted metadata from JSON file."""
-        self.metadata = load_metadata(self.metadata_file)
+        """Load extracted metadata from JSON file, reusing an unchanged parse."""
+        try:
+            st = self.metadata_file.stat()
+            key = (str(self.metadata_file.resolve()), st.st_mtime_ns, st.st_size)
+        except OSError:
+            key = None
+
+        cached = self._metadata_cache.get(key) if key else None
+        if cached is not None:
+            self.metadata = cached
+        else:
+            self.metadata = load_metadata(self.metadata_file)
+            if key and self.metadata:
+                self._metadata_cache[key] = self.metadata
         if not self.metadata:
             self.errors.append(f"Failed to load metadata from {self.metadata_file}")
             return False
@@ -72,30 +188,30 @@ class PlaybookContextAnalyzer:
         self.logger.info(f"Loaded metadata for {len(self.commands)} commands")
         return True
 
-    def _analyze_git_state(self) -> Optional[Dict[str, Any]]:
-        """Analyze current git state."""
+    def _analyze_git_state(self, status: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Analyze current git state. `status` reuses output already fetched."""
         try:
-            # Get current branch
-            branch = self._run_git_command("git branch --show-current").strip()
+            # status and log are independent; run them concurrently
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                if status is None:
+                    status_future = pool.submit(self._run_git_command, self._status_argv())
+                log_future = pool.submit(self._run_git_command, [self._git, "log", "--oneline", "-10"])
+                if status is None:
+                    status = status_future.result()
+                commits_output = log_future.result().strip()
+
+            # One status call yields branch, staged and unstaged files
+            branch, changed_files_staged, diff_files_list, untracked = self._parse_status(status)
             if not branch:
                 branch = "main"
-
-            # Get changed files
-            unstaged = self._run_git_command("git status --porcelain").strip()
-            staged = self._run_git_command("git diff --cached --name-only").strip()
-            changed_files_unstaged = [line.split(maxsplit=1)[1] for line in unstaged.split("\n") if line.strip()]
-            changed_files_staged = staged.split("\n") if staged else []
-            all_changed_files = list(set(changed_files_unstaged + changed_files_staged))
+            changed_files_unstaged = diff_files_list + untracked
+            # Ordered dedup: files both staged and unstaged appear once, in status order
+            all_changed_files = list(dict.fromkeys(chain(changed_files_unstaged, changed_files_staged)))
 
             # Get recent commits
-            commits_output = self._run_git_command("git log --oneline -10").strip()
             commits = commits_output.split("\n") if commits_output else []
             commit_count = len([c for c in commits if c.strip()])
 
-            # Get file diffs
-            diff_files = self._run_git_command("git diff --name-only").strip()
-            diff_files_list = [f for f in diff_files.split("\n") if f.strip()] if diff_files else []
-
             return {
                 "branch": branch,
                 "changed_files": all_changed_files,
@@ -110,22 +226,103 @@ class PlaybookContextAnalyzer:
             self.logger.error(f"Error analyzing git state: {e}")
             return None
 
-    def _run_git_command(self, command: str) -> str:
-        """Run git command safely."""
+    def _status_argv(self) -> List[str]:
+        """Argv for the porcelain v2 status call parsed by _parse_status."""
+        return [self._git, "status", "--porcelain=v2", "--branch", "-z"]
+
+    def _cache_lookup_key(self) -> Tuple[Optional[str], Optional[Path], Optional[str]]:
+        """Return (status output, cache file, cache key); key is None outside a repo.
+
+        The key covers the working directory, HEAD, the full status output (so
+        any edit or stage invalidates it) and the metadata file's mtime.
+        """
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            status_future = pool.submit(self._run_git_command, self._status_argv())
+            rev_future = pool.submit(self._run_git_command, [self._git, "rev-parse", "--git-dir", "HEAD"])
+            status = status_future.result()
+            rev = rev_future.result().split("\n")
+
+        if len(rev) < 2 or not rev[0]:
+            return status, None, None
+        git_dir, head = rev[0], rev[1]
+        try:
+            metadata_mtime = self.metadata_file.stat().st_mtime_ns
+        except OSError:
+            return status, None, None
+
+        digest = hashlib.sha256()
+        for part in (str(Path.cwd()), head, status, str(self.metadata_file.resolve()), str(metadata_mtime)):
+            digest.update(part.encode("utf-8", "surrogateescape") + b"\0")
+        return status, Path(git_dir) / CACHE_FILENAME, digest.hexdigest()
+
+    def _read_cache(self, cache_file: Optional[Path], cache_key: Optional[str]) -> Optional[str]:
+        """Return cached output if it matches the key and is within the TTL."""
+        if not cache_key:
+            return None
+        try:
+            if time.time() - cache_file.stat().st_mtime > CACHE_TTL_SECONDS:
+                return None
+            cached = json.loads(cache_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if cached.get("key") != cache_key:
+            return None
+        return cached.get("output")
+
+    def _write_cache(self, cache_file: Path, cache_key: str, output: str) -> None:
+        """Store output under the cache key; failures only cost the cache."""
+        try:
+            cache_file.write_text(json.dumps({"key": cache_key, "output": output}), encoding="utf-8")
+        except OSError as e:
+            self.logger.debug(f"Could not write analysis cache: {e}")
+
+    def _parse_status(self, output: str) -> Tuple[str, List[str], List[str], List[str]]:
+        """Parse `git status --porcelain=v2 --branch -z` output.
+
+        Returns (branch, staged, unstaged, untracked). Records are NUL-separated;
+        `1`/`2`/`u` entries carry XY flags (X = index, Y = worktree, `.` means
+        unchanged), and a `2` (rename/copy) entry is followed by an extra record
+        holding the original path. `unstaged` matches `git diff --name-only`.
+        """
+        branch = ""
+        staged: List[str] = []
+        unstaged: List[str] = []
+        untracked: List[str] = []
+        records = iter(output.split("\0"))
+        for record in records:
+            if record.startswith("# branch.head "):
+                head = record[len("# branch.head "):]
+                branch = "" if head == "(detached)" else head
+            elif record.startswith("? "):
+                untracked.append(record[2:])
+            elif record[:2] in ("1 ", "2 ", "u "):
+                # Path is the last field: 8 fields precede it for `1`, 9 for `2`, 10 for `u`
+                fields = {"1": 8, "2": 9, "u": 10}[record[0]]
+                parts = record.split(" ", fields)
+                xy, path = parts[1], parts[-1]
+                if record[0] == "2":
+                    next(records, None)  # original path of the rename/copy
+                if xy[0] != ".":
+                    staged.append(path)
+                if xy[1] != ".":
+                    unstaged.append(path)
+        return branch, staged, unstaged, untracked
+
+    def _run_git_command(self, args: List[str]) -> str:
+        """Run a git command (argv list) safely; no shell is involved."""
         try:
             result = subprocess.run(
-                command,
-                shell=True,
+                args,
                 capture_output=True,
                 text=True,
                 timeout=5,
             )
             return result.stdout
         except subprocess.TimeoutExpired:
-            self.logger.warning(f"Git command timed out: {command}")
+            self.logger.warning(f"Git command timed out: {' '.join(args)}")
             return ""
         except Exception as e:
-            self.logger.warning(f"Git command failed: {command} - {e}")
+            self.logger.warning(f"Git command failed: {' '.join(args)} - {e}")
             return ""
 
     def _detect_workflow_phase(self, git_state: Dict[str, Any]) -> str:
@@ -170,28 +367,16 @@ class PlaybookContextAnalyzer:
         for file_path in changed_files:
             file_lower = file_path.lower()
 
+            # Path-substring rules win over the suffix (tests/foo.py is a test)
             if ".github/workflows" in file_lower:
                 result["ci"].append(file_path)
             elif "test" in file_lower or "spec" in file_lower:
                 result["tests"].append(file_path)
             elif "docs/" in file_lower or ".md" in file_lower:
                 result["docs"].append(file_path)
-            elif any(
-                file_path.endswith(ext)
-                for ext in [".py", ".ts", ".tsx", ".js", ".jsx", ".go", ".rs"]
-            ):
+            elif file_path.endswith(SOURCE_SUFFIXES):
                 result["source"].append(file_path)
-            elif any(
-                file_path.endswith(name)
-                for name in [
-                    "Dockerfile",
-                    "docker-compose.yml",
-                    "package.json",
-                    "pyproject.toml",
-                    "setup.py",
-                    "go.mod",
-                ]
-            ):
+            elif file_path.endswith(CONFIG_SUFFIXES):
                 result["config"].append(file_path)
 
         # Remove empty categories
@@ -201,98 +386,30 @@ class PlaybookContextAnalyzer:
         self, git_state: Dict[str, Any], phase: str, file_types: Dict[str, List[str]]
     ) -> List[Dict[str, Any]]:
         """Generate command recommendations based on context."""
-        recommendations = []
-
-        # Phase-based recommendations
-        if phase == "START":
-            recommendations.extend(
-                [
-                    {
-                        "command": "pb-start",
-                        "reason": "Beginning feature work on new branch",
-                        "confidence": 0.95,
-                    },
-                ]
-            )
-        elif phase == "DEVELOP":
-            recommendations.extend(
-                [
-                    {
-                        "command": "pb-cycle",
-                        "reason": "Iterate on changes, get peer feedback",
-                        "confidence": 0.90,
-                    },
-                    {
-                        "command": "pb-testing",
-                        "reason": "Verify test coverage matches code changes",
-                        "confidence": 0.85,
-                    },
-                ]
-            )
-        elif phase == "FINALIZE":
-            recommendations.extend(
-                [
-                    {
-                        "command": "pb-commit",
-                        "reason": "Organize work into logical commits",
-                        "confidence": 0.90,
-                    },
-                    {
-                        "command": "pb-pr",
-                        "reason": "Create pull request for integration",
-                        "confidence": 0.90,
-                    },
-                ]
-            )
-        elif phase == "REVIEW":
-            recommendations.extend(
-                [
-                    {
-                        "command": "pb-review-code",
-                        "reason": "Review code logic and patterns",
-                        "confidence": 0.95,
-                    },
-                    {
-                        "command": "pb-review-tests",
-                        "reason": "Verify test coverage and quality",
-                        "confidence": 0.85,
-                    },
-                    {
-                        "command": "pb-security",
-                        "reason": "Check security implications",
-                        "confidence": 0.75,
-                    },
-                ]
-            )
-        elif phase == "RELEASE":
-            recommendations.extend(
-                [
-                    {
-                        "command": "pb-release",
-                        "reason": "Prepare for production release",
-                        "confidence": 0.90,
-                    },
-                    {
-                        "command": "pb-deployment",
-                        "reason": "Plan deployment strategy",
-                        "confidence": 0.80,
-                    },
-                ]
-            )
+        # Keyed by command: a duplicate only replaces an entry it beats on confidence
+        seen: Dict[str, Dict[str, Any]] = {}
+
+        def add(rec: Dict[str, Any]) -> None:
+            current = seen.get(rec["command"])
+            if current is None or rec["confidence"] > current["confidence"]:
+                seen[rec["command"]] = rec
+
+        # Phase-based recommendations (copied: scoring adds a priority key)
+        for rec in PHASE_RECOMMENDATIONS.get(phase, ()):
+            add(dict(rec))
 
         # File-type-based recommendations
-        if file_types.get("tests"):
-            if "pb-testing" not in [r["command"] for r in recommendations]:
-                recommendations.append(
-                    {
-                        "command": "pb-testing",
-                        "reason": "Test files changed, verify coverage",
-                        "confidence": 0.88,
-                    }
-                )
+        if file_types.get("tests") and "pb-testing" not in seen:
+            add(
+                {
+                    "command": "pb-testing",
+                    "reason": "Test files changed, verify coverage",
+                    "confidence": 0.88,
+                }
+            )
 
         if file_types.get("docs"):
-            recommendations.append(
+            add(
                 {
                     "command": "pb-documentation",
                     "reason": "Documentation changed, ensure clarity",
@@ -301,7 +418,7 @@ class PlaybookContextAnalyzer:
             )
 
         if file_types.get("ci"):
-            recommendations.append(
+            add(
                 {
                     "command": "pb-deployment",
                     "reason": "CI/CD workflow modified",
@@ -309,13 +426,6 @@ class PlaybookContextAnalyzer:
                 }
             )
 
-        # Deduplication: keep highest confidence for duplicate commands
-        seen = {}
-        for rec in recommendations:
-            cmd = rec["command"]
-            if cmd not in seen or rec["confidence"] > seen[cmd]["confidence"]:
-                seen[cmd] = rec
-
         return list(seen.values())
 
     def _score_and_rank(
@@ -332,16 +442,14 @@ class PlaybookContextAnalyzer:
                     tier = tier[0] if tier else "M"
 
                 # Tier-based priority: XS=5, S=4, M=3, L=2
-                tier_priority = {"XS": 5, "S": 4, "M": 3, "L": 2}.get(tier, 3)
-                rec["priority"] = tier_priority
+                rec["priority"] = TIER_PRIORITY.get(tier, 3)
             else:
                 rec["priority"] = 3
+            rec.setdefault("confidence", 0.5)
 
-        # Sort by priority (descending) then confidence (descending)
-        recommendations.sort(
-            key=lambda x: (x.get("priority", 3), x.get("confidence", 0.5)),
-            reverse=True,
-        )
+        # Sort by priority (descending) then confidence (descending); both keys
+        # are now present, so a C-level itemgetter replaces a lambda per item
+        recommendations.sort(key=itemgetter("priority", "confidence"), reverse=True)
 
         return recommendations
 
@@ -349,36 +457,33 @@ class PlaybookContextAnalyzer:
         self, git_state: Dict[str, Any], phase: str, file_types: Dict[str, List[str]]
     ) -> str:
         """Format output as markdown with recommendations."""
-        lines = []
+        buf = io.StringIO()
+        w = buf.write
+        rule = "━" * 50
 
         # Current work state
-        lines.append("# Current Work State")
-        lines.append("━" * 50)
-        lines.append("")
-        lines.append(f"**Branch**: `{git_state.get('branch', 'unknown')}`")
-        lines.append(f"**Phase**: {phase}")
+        w(f"# Current Work State\n{rule}\n\n")
+        w(f"**Branch**: `{git_state.get('branch', 'unknown')}`\n")
+        w(f"**Phase**: {phase}\n")
 
         changed_count = len(git_state.get("changed_files", []))
         if changed_count > 0:
             file_type_summary = ", ".join(
                 f"{k}/" for k in file_types.keys() if file_types[k]
             )
-            lines.append(f"**Changes**: {changed_count} files changed ({file_type_summary})")
+            w(f"**Changes**: {changed_count} files changed ({file_type_summary})\n")
         else:
-            lines.append("**Changes**: None (clean working directory)")
+            w("**Changes**: None (clean working directory)\n")
 
         commit_count = git_state.get("commit_count", 0)
-        lines.append(f"**Commits**: {commit_count} recent commits")
-        lines.append("")
+        w(f"**Commits**: {commit_count} recent commits\n\n")
 
         # Recommendations
-        lines.append("# Recommended Next Steps")
-        lines.append("━" * 50)
-        lines.append("")
+        w(f"# Recommended Next Steps\n{rule}\n\n")
 
         if not self.recommendations:
-            lines.append("No specific recommendations at this time.")
-            lines.append("Status looks good for current phase!")
+            w("No specific recommendations at this time.\n")
+            w("Status looks good for current phase!\n")
         else:
             for idx, rec in enumerate(self.recommendations, 1):
                 cmd = rec.get("command", "")
@@ -394,48 +499,43 @@ class PlaybookContextAnalyzer:
 
                 timing = self._get_tier_time(tier)
 
-                lines.append(f"{idx}. **`/{cmd}`** — {title}")
-                lines.append(f"   - {reason}")
-                lines.append(f"   - Confidence: {confidence:.0%} | Time: {timing}")
-                lines.append("")
+                w(f"{idx}. **`/{cmd}`** — {title}\n")
+                w(f"   - {reason}\n")
+                w(f"   - Confidence: {confidence:.0%} | Time: {timing}\n\n")
 
         # Why these commands?
         if self.recommendations:
-            lines.append("# Why These Commands?")
-            lines.append("━" * 50)
-            lines.append("")
+            w(f"# Why These Commands?\n{rule}\n\n")
 
             if file_types.get("tests") and file_types.get("source"):
-                lines.append(
-                    "• Both source and test files changed → Need full development cycle"
-                )
+                w("• Both source and test files changed → Need full development cycle\n")
 
             if commit_count >= 5:
-                lines.append(
-                    "• Multiple commits → Time to organize and prepare for integration"
-                )
+                w("• Multiple commits → Time to organize and prepare for integration\n")
 
-            if phase == "FINALIZE" and not git_state.get("unstaged_changes"):
-                lines.append("• All changes committed → Ready to create PR")
+            # Staged-but-uncommitted work is not "committed" either
+            if (
+                phase == "FINALIZE"
+                and not git_state.get("unstaged_changes")
+                and not git_state.get("staged_changes")
+            ):
+                w("• All changes committed → Ready to create PR\n")
 
             if file_types.get("docs"):
-                lines.append("• Documentation updated → Ensure clarity and completeness")
+                w("• Documentation updated → Ensure clarity and completeness\n")
 
             if file_types.get("ci"):
-                lines.append("• CI/CD modified → Review deployment impacts")
+                w("• CI/CD modified → Review deployment impacts\n")
 
-            lines.append("")
+            w("\n")
 
         # Additional context
-        lines.append("# Tips")
-        lines.append("━" * 50)
-        lines.append("")
-        lines.append("- Run `/pb-what-next --verbose` for detailed analysis")
-        lines.append("- Each command should take 5-60 minutes")
-        lines.append("- Return here after each step for updated recommendations")
-        lines.append("")
+        w(f"# Tips\n{rule}\n\n")
+        w("- Run `/pb-what-next --verbose` for detailed analysis\n")
+        w("- Each command should take 5-60 minutes\n")
+        w("- Return here after each step for updated recommendations\n")
 
-        return "\n".join(lines)
+        return buf.getvalue()
 
     def _get_tier_time(self, tier: Optional[str]) -> str:
         """Get estimated time for a tier."""
@@ -487,11 +587,18 @@ def main():
         help="Path to metadata JSON file",
     )
     parser.add_argument("--verbose", action="store_true", help="Enable verbose logging")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Always re-analyze instead of reusing output from the last {CACHE_TTL_SECONDS}s",
+    )
 
     args = parser.parse_args()
 
     # Analyze
-    analyzer = PlaybookContextAnalyzer(metadata_file=args.metadata, verbose=args.verbose)
+    analyzer = PlaybookContextAnalyzer(
+        metadata_file=args.metadata, verbose=args.verbose, cache=not args.no_cache
+    )
     output = analyzer.analyze()
 
     # Print output
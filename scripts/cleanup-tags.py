@@ -8,35 +8,51 @@ Usage:
     python3 scripts/cleanup-tags.py
 """
 
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from playbook_utils import iter_command_files
+
+# Match the tags line (can span multiple lines with array syntax)
+TAGS_RE = re.compile(r'^tags:\s*\[.*?\]\s*\n', re.MULTILINE)
+
 
 def remove_tags_from_metadata(content: str) -> str:
     """Remove tags line from YAML front-matter."""
-    # Match the tags line (can span multiple lines with array syntax)
-    pattern = r'^tags:\s*\[.*?\]\s*\n'
-    return re.sub(pattern, '', content, flags=re.MULTILINE)
+    return TAGS_RE.sub('', content)
+
+
+def cleanup_file(filepath: str) -> bool:
+    """Strip tags from one command file; returns True if the file was rewritten."""
+    with open(filepath) as f:
+        content = f.read()
+
+    # One pass: sub returns the content unchanged when there are no tags
+    updated_content = remove_tags_from_metadata(content)
+    if updated_content == content:
+        # Nothing to remove (or a tags block the regex can't match): leave the file alone
+        return False
+
+    with open(filepath, 'w') as f:
+        f.write(updated_content)
+    return True
 
 
 def main():
     root = Path(__file__).parent.parent
     commands_dir = root / "commands"
 
-    count = 0
-    for filepath in sorted(commands_dir.glob("**/pb-*.md")):
-        with open(filepath) as f:
-            content = f.read()
-
-        # Check if it has tags
-        if re.search(r'^tags:', content, re.MULTILINE):
-            updated_content = remove_tags_from_metadata(content)
+    filepaths = sorted(iter_command_files(commands_dir))
 
-            with open(filepath, 'w') as f:
-                f.write(updated_content)
-
-            print(f"✅ {filepath.name}")
-            count += 1
+    # Files are independent and the work is mostly I/O; map keeps output sorted
+    count = 0
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool:
+        for filepath, changed in zip(filepaths, pool.map(cleanup_file, filepaths)):
+            if changed:
+                print(f"✅ {os.path.basename(filepath)}")
+                count += 1
 
     print(f"\n✅ Removed tags from {count} commands.\n")
 
@@ -16,7 +16,6 @@ Usage:
     python3 scripts/evolution-diff.py --detailed <base-commit> <evolved-commit>
 """
 
-import json
 import re
 import sys
 import subprocess
@@ -24,21 +23,51 @@ from datetime import datetime
 from pathlib import Path
 from collections import defaultdict
 
+try:
+    import yaml
+    # libyaml's C loader when built in; same results, far faster scanning
+    YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+except ImportError:
+    # Fallback if PyYAML not available
+    yaml = None
+
+FRONT_MATTER_RE = re.compile(r'^---\n(.*?)\n---\n', re.DOTALL)
+# Same pattern for raw git output, so only the front-matter gets decoded
+FRONT_MATTER_BYTES_RE = re.compile(rb'^---\n(.*?)\n---\n', re.DOTALL)
+
 
 class EvolutionDiff:
     """Analyze differences between evolution stages."""
 
     def __init__(self):
         self.commands_dir = Path("commands")
-
-    def extract_metadata(self, content: str) -> dict | None:
-        """Extract YAML front-matter from markdown."""
-        match = re.match(r'^---\n(.*?)\n---\n', content, re.DOTALL)
-        if not match:
+        # Long-lived `git cat-file --batch`, started on first use
+        self._cat_file = None
+        # Last get_changed_commands result and its per-field grouping
+        self._changes = None
+        self._field_changes = {}
+
+    def extract_metadata(self, content: str | bytes) -> dict | None:
+        """Extract YAML front-matter from markdown (text or raw bytes)."""
+        if isinstance(content, bytes):
+            match = FRONT_MATTER_BYTES_RE.match(content)
+            block = match.group(1).decode("utf-8") if match else None
+        else:
+            match = FRONT_MATTER_RE.match(content)
+            block = match.group(1) if match else None
+        if block is None:
             return None
 
+        if yaml is not None:
+            try:
+                metadata = yaml.load(block, Loader=YamlLoader)
+            except yaml.YAMLError:
+                return None
+            return metadata if isinstance(metadata, dict) else None
+
+        # Without PyYAML, read flat "key: value" lines
         metadata = {}
-        for line in match.group(1).split('\n'):
+        for line in block.split('\n'):
             line = line.strip()
             if not line or line.startswith('#'):
                 continue
@@ -54,26 +83,66 @@ class EvolutionDiff:
 
     def get_command_metadata_at_commit(self, commit: str, filename: str) -> dict | None:
         """Get metadata for a command at a specific git commit."""
+        content = self.read_blob(commit, filename)
+        if content is None:
+            return None
+        return self.extract_metadata(content)
+
+    def read_blob(self, commit: str, filename: str) -> bytes | None:
+        """Read a file's raw bytes at a commit through one shared `git cat-file --batch`.
+
+        Every lookup reuses the same git process instead of spawning a
+        `git show` per file. Returns None when the path doesn't exist there.
+        """
         try:
-            content = subprocess.check_output(
-                ["git", "show", f"{commit}:{filename}"],
-                text=True,
-                stderr=subprocess.DEVNULL
-            )
-            return self.extract_metadata(content)
-        except subprocess.CalledProcessError:
+            if self._cat_file is None:
+                self._cat_file = subprocess.Popen(
+                    ["git", "cat-file", "--batch"],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL
+                )
+            proc = self._cat_file
+            proc.stdin.write(f"{commit}:{filename}\n".encode("utf-8"))
+            proc.stdin.flush()
+
+            # Header is "<sha> <type> <size>", or "<spec> missing" / "<spec> ambiguous"
+            header = proc.stdout.readline().rstrip(b"\n")
+            if not header or header.endswith((b" missing", b" ambiguous")):
+                return None
+            _, obj_type, size = header.rsplit(b" ", 2)
+            data = proc.stdout.read(int(size))
+            proc.stdout.read(1)  # trailing newline after the object
+        except (OSError, ValueError):
+            self.close()
+            return None
+
+        if obj_type != b"blob":
             return None
+        return data
+
+    def close(self):
+        """Stop the cat-file process, if one is running."""
+        if self._cat_file is not None:
+            try:
+                self._cat_file.stdin.close()
+            except OSError:
+                pass
+            self._cat_file.wait()
+            self._cat_file = None
 
     def get_changed_commands(self, base_commit: str, evolved_commit: str) -> dict:
         """Find commands that changed between commits."""
         try:
-            # Get list of changed files
+            # Get list of changed files; -z keeps paths unquoted and NUL-separated
             diff_output = subprocess.check_output(
-                ["git", "diff", "--name-only", f"{base_commit}...{evolved_commit}"],
-                text=True
-            ).strip()
+                ["git", "diff", "--name-only", "-z", f"{base_commit}...{evolved_commit}"]
+            )
 
-            changed_files = [f for f in diff_output.split('\n') if f.startswith('commands/')]
+            # Filter on raw bytes so only command paths get decoded
+            changed_files = [
+                f.decode("utf-8") for f in diff_output.split(b"\0") if f.startswith(b"commands/")
+            ]
             changes = {}
 
             for filepath in changed_files:
@@ -101,11 +170,35 @@ class EvolutionDiff:
                             'fields': field_changes
                         }
 
+            # Grouped after the loop: a later file with the same command name
+            # replaces the earlier entry, and its fields must replace them too
+            self._changes, self._field_changes = changes, self._group_fields(changes)
             return changes
 
         except subprocess.CalledProcessError as e:
             print(f"❌ Error getting diff: {e}\n")
             return {}
+        finally:
+            self.close()
+
+    def group_by_field(self, changes: dict) -> dict:
+        """Map each changed field to its (cmd_name, values) pairs.
+
+        Reuses the grouping built by get_changed_commands for the same result,
+        so the printers don't each re-walk every change.
+        """
+        if changes is self._changes:
+            return self._field_changes
+        return self._group_fields(changes)
+
+    @staticmethod
+    def _group_fields(changes: dict) -> dict:
+        """One pass over changes, bucketing (cmd_name, values) by field."""
+        field_changes = defaultdict(list)
+        for cmd_name, change in changes.items():
+            for field, values in change['fields'].items():
+                field_changes[field].append((cmd_name, values))
+        return field_changes
 
     def print_summary(self, changes: dict):
         """Print summary of changes."""
@@ -117,10 +210,7 @@ class EvolutionDiff:
         print(f"Total commands changed: {len(changes)}\n")
 
         # Group by field type
-        field_changes = defaultdict(list)
-        for cmd_name, change in changes.items():
-            for field, values in change['fields'].items():
-                field_changes[field].append((cmd_name, values))
+        field_changes = self.group_by_field(changes)
 
         print("Changes by field type:\n")
         for field in sorted(field_changes.keys()):
@@ -174,10 +264,7 @@ class EvolutionDiff:
             f.write(f"**Total Changes:** {len(changes)}\n\n")
 
             # Summary by field
-            field_changes = defaultdict(list)
-            for cmd_name, change in changes.items():
-                for field, values in change['fields'].items():
-                    field_changes[field].append((cmd_name, values))
+            field_changes = self.group_by_field(changes)
 
             f.write("## Changes by Field\n\n")
             for field in sorted(field_changes.keys()):
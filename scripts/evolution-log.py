@@ -31,49 +31,194 @@ Usage:
     python3 scripts/evolution-log.py --analyze
 """
 
-import json
+import hashlib
 import sys
-from datetime import datetime
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from pathlib import Path
-from collections import defaultdict
+
+from playbook_utils import json_dumps, json_loads, write_atomic
+
+
+def _now_iso(_now=datetime.now, _tz=timezone.utc) -> str:
+    """Current UTC time as ISO-8601, to the second (defaults bind the lookups)."""
+    return _now(_tz).isoformat(timespec="seconds")
+
+
+def _cycles_digest(cycles: list) -> str:
+    """Fingerprint of the cycles the stored aggregates were counted from."""
+    return hashlib.sha256(json_dumps(cycles, indent=False)).hexdigest()
 
 
 class EvolutionLog:
     """Manage structured evolution audit trail."""
 
+    # Field order here is the on-disk key order of every cycle
+    _CYCLE_TEMPLATE = {
+        "cycle": None,
+        "started_at": None,
+        "trigger": None,  # "quarterly", "version_upgrade", "user_feedback", "manual"
+        "capability_changes": "",
+        "changes": None,
+        "status": "in_progress",  # "in_progress", "completed", "reverted"
+        "snapshot_id": None,
+        "pr_number": None,
+    }
+
     def __init__(self):
         self.log_file = Path("todos/evolution-audit.json")
+        # Append-only journal of changes recorded since the last full save
+        self.journal_file = Path("todos/evolution-audit.jsonl")
+        self._batching = False
+        self._dirty = False
         self._load_log()
 
     def _load_log(self):
-        """Load existing log."""
-        if self.log_file.exists():
-            with open(self.log_file) as f:
-                self.log = json.load(f) or {"cycles": [], "version": "1.0"}
-        else:
+        """Load existing log, then replay any journaled changes on top."""
+        try:
+            st = self.log_file.stat()
+        except FileNotFoundError:
+            st = None
+        # A missing or zero-byte file is a fresh log; no need to decode it
+        if st is None or st.st_size == 0:
             self.log = {"cycles": [], "version": "1.0"}
+        else:
+            self.log = json_loads(self.log_file.read_bytes())
+        aggregates = self.log.get("_aggregates")
+        # Trust stored counts only if the cycles are the ones they were counted
+        # from; a hand edit or merge of the JSON changes the digest
+        if aggregates and aggregates.pop("cycles_digest", None) == _cycles_digest(
+            self.log["cycles"]
+        ):
+            aggregates["field_changes"] = Counter(aggregates["field_changes"])
+            aggregates["field_transitions"] = {
+                field: Counter(t) for field, t in aggregates["field_transitions"].items()
+            }
+            aggregates["triggers"] = Counter(aggregates["triggers"])
+        else:
+            self._rebuild_aggregates()
+        self._replay_journal()
+        # Cycle name -> position in the list; a reused name maps to its latest cycle
+        self._cycle_idx = {c["cycle"]: i for i, c in enumerate(self.log["cycles"])}
+
+    def _replay_journal(self):
+        """Apply journal entries not yet folded into the base log.
+
+        Each entry names its cycle's index and the change's position in that
+        cycle, so replay is idempotent: an entry already in the base (a crash
+        between rewriting the base and clearing the journal) is skipped, as is
+        a torn final line.
+        """
+        if not self.journal_file.exists():
+            return
+        cycles = self.log["cycles"]
+        for line in self.journal_file.read_bytes().splitlines():
+            try:
+                entry = json_loads(line)
+            except ValueError:
+                continue
+            if entry.get("op") != "change" or not 0 <= entry["index"] < len(cycles):
+                continue
+            changes = cycles[entry["index"]]["changes"]
+            if len(changes) == entry["position"]:
+                changes.append(entry["change"])
+                self._count_change(entry["change"])
+
+    def _rebuild_aggregates(self):
+        """Recount the analysis aggregates from scratch (missing or stale)."""
+        self.log["_aggregates"] = {
+            "field_changes": Counter(), "field_transitions": {}, "triggers": Counter(),
+        }
+        for cycle in self.log["cycles"]:
+            self._count_cycle(cycle)
+            for change in cycle["changes"]:
+                self._count_change(change)
+
+    def _count_cycle(self, cycle: dict):
+        """Fold one cycle's trigger into the aggregates."""
+        self.log["_aggregates"]["triggers"][cycle["trigger"]] += 1
+
+    def _count_change(self, change: dict):
+        """Fold one change into the aggregates analyze_patterns reports."""
+        aggregates = self.log["_aggregates"]
+        field = change["field"]
+        aggregates["field_changes"][field] += 1
+        # Bucketed by field and keyed by the display string (not a tuple) so
+        # the stored counts stay JSON-friendly
+        transitions = aggregates["field_transitions"].setdefault(field, Counter())
+        transitions[f"{change['before']} → {change['after']}"] += 1
 
     def _save_log(self):
-        """Save log."""
+        """Save the full log and clear the journal it now contains."""
         self.log_file.parent.mkdir(exist_ok=True)
-        with open(self.log_file, 'w') as f:
-            json.dump(self.log, f, indent=2)
+        # Encode first, then swap the file in whole: a crash mid-write leaves
+        # the previous log intact rather than truncated JSON
+        aggregates = {
+            **self.log["_aggregates"], "cycles_digest": _cycles_digest(self.log["cycles"]),
+        }
+        write_atomic(self.log_file, json_dumps({**self.log, "_aggregates": aggregates}))
+        self.journal_file.unlink(missing_ok=True)
+
+    def _persist(self):
+        """Save now, or mark the log dirty while inside batch()."""
+        if self._batching:
+            self._dirty = True
+        else:
+            self._save_log()
+
+    @contextmanager
+    def batch(self):
+        """Coalesce every mutation in the block into one save on exit.
+
+            with log.batch():
+                for change in changes:
+                    log.record_change(...)
+        """
+        if self._batching:
+            yield self
+            return
+        self._batching, self._dirty = True, False
+        try:
+            yield self
+        finally:
+            self._batching = False
+            if self._dirty:
+                self._save_log()
+
+    def _find_cycle(self, cycle_name: str):
+        """Return the cycle recorded under this name, or None."""
+        index = self._cycle_idx.get(cycle_name)
+        return None if index is None else self.log["cycles"][index]
+
+    def _append_change(self, cycle: dict, change: dict):
+        """Journal one change: O(1) bytes written instead of rewriting the log."""
+        entry = {
+            "op": "change",
+            "cycle": cycle["cycle"],
+            "index": self._cycle_idx[cycle["cycle"]],
+            "position": len(cycle["changes"]),
+            "change": change,
+        }
+        with open(self.journal_file, 'ab') as f:
+            f.write(json_dumps(entry, indent=False) + b"\n")
 
     def record_cycle(self, cycle_name: str, trigger: str, capability_changes: str) -> dict:
         """Record a new evolution cycle."""
+        # "changes" must be a fresh list per cycle, never shared via the template
         cycle = {
+            **self._CYCLE_TEMPLATE,
             "cycle": cycle_name,
-            "started_at": datetime.now().isoformat(),
-            "trigger": trigger,  # "quarterly", "version_upgrade", "user_feedback", "manual"
+            "started_at": _now_iso(),
+            "trigger": trigger,
             "capability_changes": capability_changes,
             "changes": [],
-            "status": "in_progress",  # "in_progress", "completed", "reverted"
-            "snapshot_id": None,
-            "pr_number": None,
         }
 
+        self._cycle_idx[cycle_name] = len(self.log["cycles"])
         self.log["cycles"].append(cycle)
-        self._save_log()
+        self._count_cycle(cycle)
+        self._persist()
 
         print(f"✅ Evolution cycle recorded: {cycle_name}\n")
         return cycle
@@ -81,14 +226,8 @@ class EvolutionLog:
     def record_change(self, cycle_name: str, command: str, field: str,
                      before: str, after: str, rationale: str) -> bool:
         """Record a change within current cycle."""
-        # Find the cycle
-        cycle = None
-        for c in self.log["cycles"]:
-            if c["cycle"] == cycle_name and c["status"] == "in_progress":
-                cycle = c
-                break
-
-        if not cycle:
+        cycle = self._find_cycle(cycle_name)
+        if not cycle or cycle["status"] != "in_progress":
             print(f"❌ No active cycle: {cycle_name}\n")
             return False
 
@@ -99,56 +238,60 @@ class EvolutionLog:
             "before": before,
             "after": after,
             "rationale": rationale,
-            "recorded_at": datetime.now().isoformat(),
+            "recorded_at": _now_iso(),
         }
 
+        if self._batching:
+            self._dirty = True
+        else:
+            self._append_change(cycle, change)
         cycle["changes"].append(change)
-        self._save_log()
+        self._count_change(change)
 
         print(f"✅ Change recorded: {command}.{field}: {before} → {after}\n")
         return True
 
     def set_cycle_snapshot(self, cycle_name: str, snapshot_id: str) -> bool:
         """Link cycle to snapshot."""
-        for c in self.log["cycles"]:
-            if c["cycle"] == cycle_name:
-                c["snapshot_id"] = snapshot_id
-                self._save_log()
-                print(f"✅ Snapshot linked: {snapshot_id}\n")
-                return True
+        c = self._find_cycle(cycle_name)
+        if not c:
+            print(f"❌ Cycle not found: {cycle_name}\n")
+            return False
 
-        print(f"❌ Cycle not found: {cycle_name}\n")
-        return False
+        c["snapshot_id"] = snapshot_id
+        self._persist()
+        print(f"✅ Snapshot linked: {snapshot_id}\n")
+        return True
 
     def complete_cycle(self, cycle_name: str, pr_number: int = None) -> bool:
         """Mark cycle as complete."""
-        for c in self.log["cycles"]:
-            if c["cycle"] == cycle_name:
-                c["status"] = "completed"
-                c["completed_at"] = datetime.now().isoformat()
-                if pr_number:
-                    c["pr_number"] = pr_number
-                self._save_log()
-                print(f"✅ Evolution cycle completed: {cycle_name}\n")
-                return True
+        c = self._find_cycle(cycle_name)
+        if not c:
+            print(f"❌ Cycle not found: {cycle_name}\n")
+            return False
 
-        print(f"❌ Cycle not found: {cycle_name}\n")
-        return False
+        c["status"] = "completed"
+        c["completed_at"] = _now_iso()
+        if pr_number:
+            c["pr_number"] = pr_number
+        self._persist()
+        print(f"✅ Evolution cycle completed: {cycle_name}\n")
+        return True
 
     def revert_cycle(self, cycle_name: str, reason: str) -> bool:
         """Mark cycle as reverted (if it broke something)."""
-        for c in self.log["cycles"]:
-            if c["cycle"] == cycle_name:
-                c["status"] = "reverted"
-                c["reverted_at"] = datetime.now().isoformat()
-                c["revert_reason"] = reason
-                self._save_log()
-                print(f"⚠️  Evolution cycle reverted: {cycle_name}\n")
-                print(f"   Reason: {reason}\n")
-                return True
+        c = self._find_cycle(cycle_name)
+        if not c:
+            print(f"❌ Cycle not found: {cycle_name}\n")
+            return False
 
-        print(f"❌ Cycle not found: {cycle_name}\n")
-        return False
+        c["status"] = "reverted"
+        c["reverted_at"] = _now_iso()
+        c["revert_reason"] = reason
+        self._persist()
+        print(f"⚠️  Evolution cycle reverted: {cycle_name}\n")
+        print(f"   Reason: {reason}\n")
+        return True
 
     def show_history(self):
         """Display evolution history."""
@@ -156,29 +299,30 @@ class EvolutionLog:
             print("No evolution cycles recorded.\n")
             return
 
-        print("\n📜 Evolution History\n")
-        print("=" * 80)
+        out = ["\n📜 Evolution History\n", "=" * 80]
 
         for cycle in reversed(self.log["cycles"]):
-            print(f"\n{cycle['cycle']}")
-            print(f"  Status: {cycle['status']}")
-            print(f"  Started: {cycle['started_at']}")
-            print(f"  Trigger: {cycle['trigger']}")
-            print(f"  Capabilities: {cycle['capability_changes']}")
-            print(f"  Changes: {len(cycle['changes'])} command(s)")
+            out.append(f"\n{cycle['cycle']}")
+            out.append(f"  Status: {cycle['status']}")
+            out.append(f"  Started: {cycle['started_at']}")
+            out.append(f"  Trigger: {cycle['trigger']}")
+            out.append(f"  Capabilities: {cycle['capability_changes']}")
+            out.append(f"  Changes: {len(cycle['changes'])} command(s)")
             if cycle.get('snapshot_id'):
-                print(f"  Snapshot: {cycle['snapshot_id']}")
+                out.append(f"  Snapshot: {cycle['snapshot_id']}")
             if cycle.get('pr_number'):
-                print(f"  PR: #{cycle['pr_number']}")
+                out.append(f"  PR: #{cycle['pr_number']}")
 
             if cycle["changes"]:
-                print(f"\n  Changes:")
+                out.append(f"\n  Changes:")
                 for change in cycle["changes"]:
-                    print(f"    • {change['command']}.{change['field']}: "
-                          f"{change['before']} → {change['after']}")
-                    print(f"      {change['rationale']}")
+                    out.append(f"    • {change['command']}.{change['field']}: "
+                               f"{change['before']} → {change['after']}")
+                    out.append(f"      {change['rationale']}")
 
-        print("\n" + "=" * 80 + "\n")
+        out.append("\n" + "=" * 80 + "\n")
+        # One write for the whole report instead of a print() per line
+        sys.stdout.write("\n".join(out) + "\n")
 
     def analyze_patterns(self):
         """Analyze patterns in evolution history."""
@@ -189,57 +333,41 @@ class EvolutionLog:
         print("\n🔬 Evolution Pattern Analysis\n")
         print("=" * 80)
 
-        # Count changes by field
-        field_changes = defaultdict(int)
-        field_transitions = defaultdict(lambda: defaultdict(int))
-
-        for cycle in self.log["cycles"]:
-            for change in cycle["changes"]:
-                field = change["field"]
-                before = change["before"]
-                after = change["after"]
-
-                field_changes[field] += 1
-                field_transitions[field][(before, after)] += 1
+        # Counts are maintained as changes are recorded, not rescanned here
+        aggregates = self.log["_aggregates"]
+        field_changes = aggregates["field_changes"]
+        field_transitions = aggregates["field_transitions"]
 
         print("\nMost Frequently Changed Fields:")
-        for field, count in sorted(field_changes.items(), key=lambda x: -x[1])[:5]:
+        for field, count in field_changes.most_common(5):
             print(f"  {field}: {count} changes")
 
         print("\nCommon Transitions:")
         for field, transitions in field_transitions.items():
             print(f"\n  {field}:")
-            for (before, after), count in sorted(
-                transitions.items(),
-                key=lambda x: -x[1]
-            )[:3]:
-                print(f"    {before} → {after}: {count} times")
+            for transition, count in transitions.most_common(3):
+                print(f"    {transition}: {count} times")
 
         # Analyze by cycle trigger
         print("\nEvolution by Trigger Type:")
-        triggers = defaultdict(int)
-        for cycle in self.log["cycles"]:
-            triggers[cycle["trigger"]] += 1
-
-        for trigger, count in sorted(triggers.items()):
+        for trigger, count in sorted(aggregates["triggers"].items()):
             print(f"  {trigger}: {count} cycle(s)")
 
         print("\n" + "=" * 80 + "\n")
 
     def export_timeline(self, output_file: str = "todos/evolution-timeline.json"):
         """Export timeline for visualization."""
-        timeline = []
-
-        for cycle in self.log["cycles"]:
-            timeline.append({
+        timeline = [
+            {
                 "cycle": cycle["cycle"],
                 "date": cycle["started_at"],
                 "changes": len(cycle["changes"]),
                 "status": cycle["status"],
-            })
+            }
+            for cycle in self.log["cycles"]
+        ]
 
-        with open(output_file, 'w') as f:
-            json.dump(timeline, f, indent=2)
+        Path(output_file).write_bytes(json_dumps(timeline))
 
         print(f"✅ Timeline exported to: {output_file}\n")
 
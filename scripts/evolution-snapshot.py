@@ -18,36 +18,72 @@ Usage:
     python3 scripts/evolution-snapshot.py --rollback <snapshot-id>
 """
 
-import json
 import sys
 import subprocess
 from datetime import datetime
 from pathlib import Path
 
+from playbook_utils import json_dumps, json_loads, write_atomic
+
 
 class EvolutionSnapshot:
     """Manage evolution snapshots for safe rollback."""
 
     def __init__(self):
         self.snapshots_dir = Path("todos/evolution-snapshots")
-        # parents=True: todos/ is gitignored and absent on a fresh clone, so
-        # without it even read-only --list/--show crash here in the constructor.
-        self.snapshots_dir.mkdir(parents=True, exist_ok=True)
+        # Created on first save, so read-only --list/--show touch nothing
+        self._dir_created = False
         self.snapshots_file = self.snapshots_dir / "snapshots.json"
         self._load_snapshots()
 
     def _load_snapshots(self):
         """Load existing snapshots metadata."""
-        if self.snapshots_file.exists():
-            with open(self.snapshots_file) as f:
-                self.snapshots = json.load(f) or {}
-        else:
+        try:
+            st = self.snapshots_file.stat()
+        except FileNotFoundError:
+            st = None
+        if st is None or st.st_size == 0:
             self.snapshots = {}
+            return
+        self.snapshots = json_loads(self.snapshots_file.read_bytes())
 
     def _save_snapshots(self):
         """Save snapshots metadata."""
-        with open(self.snapshots_file, 'w') as f:
-            json.dump(self.snapshots, f, indent=2)
+        if not self._dir_created:
+            # parents=True: todos/ is gitignored and absent on a fresh clone
+            self.snapshots_dir.mkdir(parents=True, exist_ok=True)
+            self._dir_created = True
+        # Encode first, then swap the file in whole so a crash mid-write
+        # can't leave truncated JSON behind
+        write_atomic(self.snapshots_file, json_dumps(self.snapshots))
+
+    def _read_head(self) -> tuple:
+        """Return (commit, branch) for HEAD, read straight from .git.
+
+        Falls back to a single `git rev-parse` when .git is not a plain
+        directory (worktrees, submodules) or the ref can't be resolved here.
+        A detached HEAD reports branch "HEAD", as `--abbrev-ref` does.
+        """
+        git_dir = Path(".git")
+        try:
+            head = (git_dir / "HEAD").read_text().strip()
+            if not head.startswith("ref: "):
+                return head, "HEAD"
+            ref = head[len("ref: "):]
+            branch = ref.removeprefix("refs/heads/")
+            ref_file = git_dir / ref
+            if ref_file.is_file():
+                return ref_file.read_text().strip(), branch
+            for line in (git_dir / "packed-refs").read_text().splitlines():
+                if line.endswith(" " + ref):
+                    return line.split(" ", 1)[0], branch
+        except OSError:
+            pass
+        commit, branch = subprocess.check_output(
+            ["git", "rev-parse", "HEAD", "--abbrev-ref", "HEAD"],
+            text=True
+        ).split()
+        return commit, branch
 
     def create(self, message: str) -> str:
         """Create a snapshot before evolution.
@@ -59,12 +95,9 @@ class EvolutionSnapshot:
 
         print(f"\n📸 Creating snapshot: {snapshot_id}")
 
-        # Get current commit hash
+        # Get current commit hash and branch
         try:
-            commit = subprocess.check_output(
-                ["git", "rev-parse", "HEAD"],
-                text=True
-            ).strip()
+            commit, branch = self._read_head()
         except subprocess.CalledProcessError as e:
             print(f"❌ Error getting commit hash: {e}")
             return None
@@ -85,10 +118,7 @@ class EvolutionSnapshot:
             "created_at": datetime.now().isoformat(),
             "message": message,
             "commit": commit,
-            "branch": subprocess.check_output(
-                ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-                text=True
-            ).strip(),
+            "branch": branch,
             "status": "active",
         }
         self._save_snapshots()
@@ -16,13 +16,34 @@ Usage:
     python3 scripts/evolution-trigger-detector.py --report > evolution-triggers.md
 """
 
-import json
+import functools
+import io
+import os
 import re
 import subprocess
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from collections import defaultdict
 
+from playbook_utils import iter_command_files, json_loads
+
+# Extract last_reviewed date. Accept any YAML quoting style (double, single, or
+# unquoted) -- a double-quote-only match silently dropped schema-valid dates and
+# deflated the stale count below threshold.
+LAST_REVIEWED_RE = re.compile(
+    rb'^last_reviewed:\s*["\']?(\d{4}-\d{2}-\d{2})["\']?', re.MULTILINE
+)
+
+# Front-matter sits at the top of each command; this covers it with room to spare
+HEAD_BYTES = 4096
+
+
+@functools.lru_cache(maxsize=8)
+def _load_log(path: str, mtime_ns: int, size: int) -> dict:
+    """Parse the audit log. The stat fields are only cache keys, so a rewrite
+    of the file is a cache miss; callers must not mutate the result."""
+    return json_loads(Path(path).read_bytes())
+
 
 class EvolutionTriggerDetector:
     """Detect signals that evolution is needed."""
@@ -31,18 +52,20 @@ class EvolutionTriggerDetector:
         self.commands_dir = Path("commands")
         self.log_file = Path("todos/evolution-audit.json")
         self.triggers = []
+        self._all_commands = None
 
     def check_time_since_last_evolution(self, threshold_days: int = 90) -> dict | None:
         """Check if enough time has passed since last evolution."""
-        if not self.log_file.exists():
+        try:
+            st = self.log_file.stat()
+        except FileNotFoundError:
             return {
                 "type": "first_evolution",
                 "severity": "info",
                 "message": "No evolution cycles recorded yet. This is the first!",
             }
 
-        with open(self.log_file) as f:
-            log = json.load(f)
+        log = _load_log(str(self.log_file.absolute()), st.st_mtime_ns, st.st_size)
 
         if not log.get("cycles"):
             return {
@@ -53,7 +76,8 @@ class EvolutionTriggerDetector:
 
         last_cycle = log["cycles"][-1]
         last_date = datetime.fromisoformat(last_cycle["started_at"])
-        days_since = (datetime.now() - last_date).days
+        # Older logs hold naive local times, newer ones UTC; compare like with like
+        days_since = (datetime.now(last_date.tzinfo) - last_date).days
 
         if days_since >= threshold_days:
             return {
@@ -69,25 +93,28 @@ class EvolutionTriggerDetector:
     def check_command_staleness(self, threshold_days: int = 180) -> dict | None:
         """Check if commands have stale last_reviewed dates."""
         stale_commands = []
-        cutoff_date = (datetime.now() - timedelta(days=threshold_days)).date()
-
-        for filepath in sorted(self.commands_dir.glob("**/pb-*.md")):
-            with open(filepath) as f:
-                content = f.read()
-
-            # Extract last_reviewed date. Accept any YAML quoting style (double,
-            # single, or unquoted) -- a double-quote-only match silently dropped
-            # schema-valid dates and deflated the stale count below threshold.
-            match = re.search(
-                r'^last_reviewed:\s*["\']?(\d{4}-\d{2}-\d{2})["\']?',
-                content,
-                re.MULTILINE,
-            )
+        today = datetime.now().date()
+        cutoff_date = today - timedelta(days=threshold_days)
+        all_commands = self.get_all_commands()
+        total = len(all_commands)
+        threshold = total * 0.25
+
+        for i, filepath in enumerate(all_commands):
+            if len(stale_commands) + (total - i) <= threshold:
+                # Even if every remaining file were stale we could not trigger
+                return None
+            with open(filepath, 'rb') as f:
+                head = f.read(HEAD_BYTES)
+                match = LAST_REVIEWED_RE.search(head)
+                if match is None and len(head) == HEAD_BYTES:
+                    # Unusually long file head: fall back to the whole file
+                    match = LAST_REVIEWED_RE.search(head + f.read())
+
             if match:
                 try:
-                    reviewed_date = datetime.fromisoformat(match.group(1)).date()
+                    reviewed_date = date.fromisoformat(match.group(1).decode())
                     if reviewed_date <= cutoff_date:
-                        days_stale = (datetime.now().date() - reviewed_date).days
+                        days_stale = (today - reviewed_date).days
                         stale_commands.append({
                             "command": filepath.stem,
                             "last_reviewed": str(reviewed_date),
@@ -96,12 +123,12 @@ class EvolutionTriggerDetector:
                 except ValueError:
                     pass
 
-        if len(stale_commands) > len(self.get_all_commands()) * 0.25:  # > 25%
+        if len(stale_commands) > threshold:  # > 25%
             return {
                 "type": "staleness_trigger",
                 "severity": "medium",
                 "stale_count": len(stale_commands),
-                "total_commands": len(self.get_all_commands()),
+                "total_commands": total,
                 "message": f"{len(stale_commands)} commands have stale reviews (>{threshold_days} days old)",
                 "recommendation": f"Evolution cycle would update {len(stale_commands)} commands",
                 "stale_commands": stale_commands[:10],  # Show top 10
@@ -130,25 +157,27 @@ class EvolutionTriggerDetector:
         # For now, just check if there are recent TODOs
         todos_dir = Path("todos")
 
-        if todos_dir.exists():
-            # Check for playbook-related TODOs
-            feedback_files = list(todos_dir.glob("*feedback*"))
-            if feedback_files:
-                feedback_count = sum(1 for f in feedback_files if f.stat().st_size > 0)
-                if feedback_count > 0:
-                    return {
-                        "type": "user_feedback",
-                        "severity": "medium",
-                        "feedback_items": feedback_count,
-                        "message": f"Found {feedback_count} items of user feedback",
-                        "recommendation": "Review feedback in evolution cycle",
-                    }
+        if todos_dir.is_dir():
+            # Check for playbook-related TODOs: filter and size them in one pass
+            with os.scandir(todos_dir) as entries:
+                feedback_count = sum(1 for e in entries
+                                     if "feedback" in e.name and e.stat().st_size > 0)
+            if feedback_count > 0:
+                return {
+                    "type": "user_feedback",
+                    "severity": "medium",
+                    "feedback_items": feedback_count,
+                    "message": f"Found {feedback_count} items of user feedback",
+                    "recommendation": "Review feedback in evolution cycle",
+                }
 
         return None
 
     def get_all_commands(self):
-        """Get list of all commands."""
-        return list(self.commands_dir.glob("**/pb-*.md"))
+        """Get sorted list of all commands (globbed once per detector)."""
+        if self._all_commands is None:
+            self._all_commands = sorted(map(Path, iter_command_files(self.commands_dir)))
+        return self._all_commands
 
     def run_detection(self) -> list[dict]:
         """Run all trigger detection checks."""
@@ -202,41 +231,47 @@ class EvolutionTriggerDetector:
                 print(f"   → {trigger['recommendation']}")
             print()
 
-    def generate_markdown_report(self, triggers: list[dict], output_file: str = "todos/evolution-triggers.md") -> None:
-        """Generate markdown report of triggers."""
-        with open(output_file, 'w') as f:
-            f.write("# Evolution Triggers Report\n\n")
-            f.write(f"**Generated:** {datetime.now().isoformat()}\n\n")
+    def render_markdown_report(self, triggers: list[dict]) -> str:
+        """Render the markdown report of triggers into one string."""
+        buf = io.StringIO()
+        buf.write("# Evolution Triggers Report\n\n")
+        buf.write(f"**Generated:** {datetime.now().isoformat()}\n\n")
 
-            if not triggers:
-                f.write("✅ No evolution triggers detected.\n\n")
-                return
+        if not triggers:
+            buf.write("✅ No evolution triggers detected.\n\n")
+            return buf.getvalue()
+
+        buf.write("## Summary\n\n")
+        buf.write(f"Found {len(triggers)} trigger(s) for evolution:\n\n")
 
-            f.write(f"## Summary\n\n")
-            f.write(f"Found {len(triggers)} trigger(s) for evolution:\n\n")
+        for trigger in triggers:
+            severity = trigger["severity"]
+            trigger_type = trigger["type"]
+            message = trigger["message"]
 
-            for trigger in triggers:
-                severity = trigger["severity"]
-                trigger_type = trigger["type"]
-                message = trigger["message"]
+            buf.write(f"### {trigger_type} ({severity})\n\n")
+            buf.write(f"{message}\n\n")
 
-                f.write(f"### {trigger_type} ({severity})\n\n")
-                f.write(f"{message}\n\n")
+            if "recommendation" in trigger:
+                buf.write(f"**Recommendation:** {trigger['recommendation']}\n\n")
 
-                if "recommendation" in trigger:
-                    f.write(f"**Recommendation:** {trigger['recommendation']}\n\n")
+            if "stale_commands" in trigger:
+                buf.write("**Stale commands (sample):**\n\n")
+                for cmd in trigger["stale_commands"]:
+                    buf.write(f"- `{cmd['command']}`: last reviewed {cmd['days_stale']} days ago\n")
+                buf.write("\n")
 
-                if "stale_commands" in trigger:
-                    f.write("**Stale commands (sample):**\n\n")
-                    for cmd in trigger["stale_commands"]:
-                        f.write(f"- `{cmd['command']}`: last reviewed {cmd['days_stale']} days ago\n")
-                    f.write("\n")
+        buf.write("## Recommendation\n\n")
+        buf.write("Consider scheduling an evolution cycle to address these triggers.\n\n")
+        buf.write("Run: `python3 scripts/evolution-snapshot.py --create 'Before evolution'`\n\n")
+        buf.write("Then: Follow the Evolution Operational Guide in `docs/evolution-operational-guide.md`\n")
 
-            f.write("## Recommendation\n\n")
-            f.write("Consider scheduling an evolution cycle to address these triggers.\n\n")
-            f.write("Run: `python3 scripts/evolution-snapshot.py --create 'Before evolution'`\n\n")
-            f.write("Then: Follow the Evolution Operational Guide in `docs/evolution-operational-guide.md`\n")
+        return buf.getvalue()
 
+    def generate_markdown_report(self, triggers: list[dict], output_file: str = "todos/evolution-triggers.md") -> None:
+        """Generate markdown report of triggers."""
+        # Rendered in memory, then written in one go
+        Path(output_file).write_text(self.render_markdown_report(triggers))
         print(f"✅ Report generated: {output_file}\n")
 
 
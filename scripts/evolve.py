@@ -16,21 +16,134 @@ Usage:
     python3 scripts/evolve.py --report        # Evolution report
 """
 
+import math
 import os
-import sys
-import json
 import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime
 from collections import defaultdict
 from typing import Dict, List, Optional, Tuple
 
+from playbook_utils import iter_command_files, json_dumps, json_loads, write_atomic
+
 try:
     import yaml
+    # libyaml's C loader when built in; same results, far faster scanning
+    YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 except ImportError:
     # Fallback if PyYAML not available
     yaml = None
 
+# Front-matter delimiter line (text mode used to fold CRLF, so accept both)
+DELIMITERS = (b"---\n", b"---\r\n")
+
+# Front-matter lines whose YAML value is unambiguous: a quoted string with no
+# escapes, a flow list of such strings, or nothing (null). Anything else --
+# bare scalars (which YAML may read as bools, numbers or dates), comments,
+# nesting -- goes to the real YAML parser.
+SIMPLE_ITEM = r"'[^'\r\n]*'|\"[^\"\\\r\n]*\""
+SIMPLE_LINE_RE = re.compile(
+    rf"([a-z_]+):(?: +({SIMPLE_ITEM}|\[ *(?:(?:{SIMPLE_ITEM}) *"
+    rf"(?:, *(?:{SIMPLE_ITEM}) *)*)?\]))? *"
+)
+SIMPLE_ITEM_RE = re.compile(SIMPLE_ITEM)
+# Plain keys YAML 1.1 would turn into booleans or null
+YAML_SPECIAL_KEYS = frozenset({"y", "n", "yes", "no", "on", "off", "true", "false", "null"})
+# Characters PyYAML rejects as non-printable or treats as extra line breaks
+SIMPLE_REJECT_RE = re.compile("[^\t\n\r\x20-\x7e\xa0-\u2027\u202a-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]")
+# last_reviewed layouts the old strptime("%Y-%m-%d") took: unpadded (and
+# space-padded) months and days included, other ISO 8601 shapes not
+LAST_REVIEWED_RE = re.compile(r"(\d\d\d\d)-(1[0-2]|0[1-9]|[1-9])-(3[01]|[12]\d|0[1-9]|[1-9]| [1-9])")
+
+
+def _parse_simple_front_matter(text: str) -> Optional[Dict]:
+    """Parse front-matter made only of simple lines, or return None.
+
+    For the subset SIMPLE_LINE_RE admits this matches yaml.safe_load exactly,
+    at a fraction of the cost; None means "use YAML".
+    """
+    if SIMPLE_REJECT_RE.search(text):
+        return None
+    metadata = {}
+    for line in text.split("\n"):
+        if not line.strip(" \r"):
+            continue
+        match = SIMPLE_LINE_RE.fullmatch(line.rstrip("\r"))
+        if match is None or match.group(1) in YAML_SPECIAL_KEYS:
+            return None
+        key, value = match.groups()
+        if value is None:
+            metadata[key] = None
+        elif value[0] == "[":
+            metadata[key] = [item[1:-1] for item in SIMPLE_ITEM_RE.findall(value)]
+        else:
+            metadata[key] = value[1:-1]
+    return metadata
+
+
+# Bump when _parse_command's output changes shape or meaning; together with
+# the YAML version and loader it keys the parse cache, so stale parses are dropped
+CACHE_VERSION = 1
+
+
+def _to_json(value):
+    """Encode a parse result for the JSON cache; dates become tagged ISO strings.
+
+    Raises TypeError for anything JSON would not round-trip (sets, bytes,
+    non-string keys, huge ints, NaN, a dict that looks like a tag) so the
+    entry goes uncached.
+    """
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"$date": value.isoformat()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(v) for v in value]
+    if isinstance(value, dict):
+        if not all(isinstance(k, str) for k in value) or (
+            len(value) == 1 and next(iter(value)) in ("$date", "$datetime")
+        ):
+            raise TypeError("dict not representable in the cache")
+        return {k: _to_json(v) for k, v in value.items()}
+    if isinstance(value, float) and not math.isfinite(value):
+        raise TypeError("non-finite float not representable in the cache")
+    if isinstance(value, int) and not -2**63 <= value < 2**64:
+        raise TypeError("integer too large for the cache")
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    raise TypeError(f"{type(value).__name__} not representable in the cache")
+
+
+def _from_json(value):
+    """Inverse of _to_json (tuples come back as lists)."""
+    if isinstance(value, list):
+        return [_from_json(v) for v in value]
+    if isinstance(value, dict):
+        if len(value) == 1:
+            tag, text = next(iter(value.items()))
+            if tag == "$datetime":
+                return datetime.fromisoformat(text)
+            if tag == "$date":
+                return date.fromisoformat(text)
+        return {k: _from_json(v) for k, v in value.items()}
+    return value
+
+
+# 'tags' is optional (Q2 2026: aligned to reality -- no command carries it;
+# mdbook indexes title/category; validated only when present). See
+# .playbook-metadata-schema.yaml.
+REQUIRED_FIELDS = ("name", "title", "category", "difficulty", "model_hint",
+                   "execution_pattern", "related_commands", "last_reviewed")
+
+# Preferred display order for the generated index
+CATEGORY_ORDER = ("core", "planning", "development", "deployment", "reviews",
+                  "repo", "people", "templates", "utilities")
+VALID_CATEGORIES = frozenset(CATEGORY_ORDER)
+VALID_DIFFICULTIES = frozenset({"beginner", "intermediate", "advanced", "expert"})
+VALID_MODELS = frozenset({"haiku", "sonnet", "opus"})
+
 class PlaybookEvolutionEngine:
     """Analyzes and evolves playbook commands."""
 
@@ -42,6 +155,49 @@ class PlaybookEvolutionEngine:
         self.commands = {}
         self.errors = []
         self.warnings = []
+        self._loaded = False
+        # Parse results from earlier runs: {path: ((mtime_ns, size), result)},
+        # loaded by load_all_commands
+        self.cache_file = self.root / "todos" / "evolve-cache.json"
+        self._cache = {}
+        self._cache_dirty = False
+
+    def _cache_key(self) -> List:
+        """What the cached parses depend on besides each file's stat."""
+        return [CACHE_VERSION, yaml.__version__, YamlLoader.__name__]
+
+    def _load_cache(self) -> Dict:
+        """Load the parse cache; anything unreadable or stale is a cold start."""
+        if yaml is None:
+            return {}
+        try:
+            data = json_loads(self.cache_file.read_bytes())
+            if data["key"] != self._cache_key():
+                return {}
+            return {
+                path: (tuple(stat_key), tuple(_from_json(result)))
+                for path, (stat_key, result) in data["entries"].items()
+            }
+        except Exception:
+            return {}
+
+    def _save_cache(self):
+        """Persist the parse cache if this run parsed anything new."""
+        if not self._cache_dirty or yaml is None:
+            return
+        entries = {}
+        for path, (stat_key, result) in self._cache.items():
+            try:
+                entries[path] = [list(stat_key), _to_json(result)]
+            except TypeError:
+                continue  # Not JSON-representable: parsed afresh next run
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            data = {"key": self._cache_key(), "entries": entries}
+            write_atomic(self.cache_file, json_dumps(data, indent=False))
+        except OSError:
+            pass
+        self._cache_dirty = False
 
     def _load_schema(self) -> Dict:
         """Load metadata schema from .playbook-metadata-schema.yaml"""
@@ -50,47 +206,177 @@ class PlaybookEvolutionEngine:
         schema_path = self.root / ".playbook-metadata-schema.yaml"
         if schema_path.exists():
             with open(schema_path) as f:
-                return yaml.safe_load(f) or {}
+                return yaml.load(f, Loader=YamlLoader) or {}
         return {}
 
     def discover_commands(self) -> List[Path]:
         """Find all command files."""
-        return sorted(self.commands_dir.glob("**/pb-*.md"))
+        return sorted(map(Path, iter_command_files(self.commands_dir)))
 
-    def extract_metadata(self, filepath: Path) -> Tuple[Optional[Dict], str]:
-        """Extract YAML front-matter from command file.
+    def _read_front_matter(self, filepath: Path) -> Optional[str]:
+        """Return the text between the leading --- delimiters, or None.
 
-        Returns: (metadata_dict, file_content)
+        Stops at the closing delimiter, so the markdown body is never read.
         """
-        with open(filepath, 'r') as f:
-            content = f.read()
-
-        # Look for YAML front-matter between --- delimiters
-        match = re.match(r'^---\n(.*?)\n---\n', content, re.DOTALL)
-        if match:
-            if yaml is None:
-                self.warnings.append(f"{filepath.name}: YAML not available, skipping metadata")
-                return None, content
-            try:
-                metadata = yaml.safe_load(match.group(1)) or {}
-                return metadata, content
-            except Exception as e:
-                self.errors.append(f"{filepath.name}: YAML parse error: {e}")
-                return None, content
+        lines = []
+        with open(filepath, 'rb') as f:
+            if f.readline() not in DELIMITERS:
+                return None
+            for line in f:
+                if line in DELIMITERS:
+                    return b"".join(lines).decode("utf-8") if lines else None
+                lines.append(line)
+        # Unterminated block
+        return None
+
+    def _parse_command(self, filepath: Path) -> Tuple[Optional[Dict], Optional[str], List[str], List[str]]:
+        """Parse one command file without touching shared state.
+
+        Returns: (metadata_dict, front_matter_text, errors, warnings)
+        """
+        front_matter = self._read_front_matter(filepath)
+        if front_matter is None:
+            # No metadata found
+            return None, None, [], []
+
+        if yaml is None:
+            return None, front_matter, [], [f"{filepath.name}: YAML not available, skipping metadata"]
+        metadata = _parse_simple_front_matter(front_matter)
+        if metadata is not None:
+            return metadata, front_matter, [], []
+        try:
+            metadata = yaml.load(front_matter, Loader=YamlLoader) or {}
+            return metadata, front_matter, [], []
+        except Exception as e:
+            return None, front_matter, [f"{filepath.name}: YAML parse error: {e}"], []
+
+    def extract_metadata(self, filepath: Path) -> Tuple[Optional[Dict], Optional[str]]:
+        """Extract YAML front-matter from command file.
 
-        # No metadata found
-        return None, content
+        Returns: (metadata_dict, front_matter_text)
+        """
+        metadata, front_matter, errors, warnings = self._parse_command(filepath)
+        self.errors.extend(errors)
+        self.warnings.extend(warnings)
+        return metadata, front_matter
 
     def load_all_commands(self):
-        """Load and parse all command files."""
-        for filepath in self.discover_commands():
-            metadata, content = self.extract_metadata(filepath)
+        """Load and parse all command files (once; later calls are no-ops)."""
+        if self._loaded:
+            return
+        self._cache = self._load_cache()
+        paths = self.discover_commands()
+        stats = []
+        stale = []
+        for filepath in paths:
+            st = filepath.stat()
+            stats.append((st.st_mtime_ns, st.st_size))
+            cached = self._cache.get(str(filepath))
+            if cached is None or cached[0] != stats[-1]:
+                stale.append(filepath)
+
+        # Overlap file reads across threads; results (and any errors/warnings)
+        # are merged back in path order so output stays deterministic
+        parsed = {}
+        if stale:
+            with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool:
+                parsed = dict(zip(stale, pool.map(self._parse_command, stale)))
+
+        cache = {}
+        for filepath, stat_key in zip(paths, stats):
+            result = parsed[filepath] if filepath in parsed else self._cache[str(filepath)][1]
+            cache[str(filepath)] = (stat_key, result)
+            metadata, _, errors, warnings = result
+            self.errors.extend(errors)
+            self.warnings.extend(warnings)
+            # No file text is held here; get_content() reads it on demand
             self.commands[filepath.name] = {
                 "path": filepath,
                 "metadata": metadata,
-                "content": content,
                 "has_metadata": metadata is not None
             }
+        self._cache_dirty = bool(parsed) or len(cache) != len(self._cache)
+        self._cache = cache
+        self._loaded = True
+
+    def get_content(self, filename: str) -> str:
+        """Read a loaded command's full file text from disk."""
+        return self.commands[filename]["path"].read_text()
+
+    def _validate_command(self, filename: str, meta: Dict, today: date) -> List[str]:
+        """Validate one command's metadata; returns its issues (maybe none)."""
+        problems = []
+
+        # Check required fields
+        for field in REQUIRED_FIELDS:
+            if field not in meta:
+                problems.append(f"MISSING: Required field '{field}'")
+
+        # Validate field values
+        if "name" in meta:
+            expected_name = filename.replace(".md", "")
+            if meta["name"] != expected_name:
+                problems.append(
+                    f"MISMATCH: name='{meta['name']}' but filename is '{expected_name}'"
+                )
+
+        if "category" in meta:
+            # isinstance first: a YAML list/dict is unhashable and would
+            # raise in a set lookup instead of being reported
+            if not isinstance(meta["category"], str) or meta["category"] not in VALID_CATEGORIES:
+                problems.append(f"INVALID: category='{meta['category']}'")
+
+        if "difficulty" in meta:
+            if not isinstance(meta["difficulty"], str) or meta["difficulty"] not in VALID_DIFFICULTIES:
+                problems.append(f"INVALID: difficulty='{meta['difficulty']}'")
+
+        if "model_hint" in meta:
+            if not isinstance(meta["model_hint"], str) or meta["model_hint"] not in VALID_MODELS:
+                problems.append(f"INVALID: model_hint='{meta['model_hint']}'")
+
+        if "related_commands" in meta:
+            related = meta["related_commands"]
+            if not isinstance(related, list):
+                problems.append("INVALID: related_commands must be a list")
+            else:
+                if len(related) > 5:
+                    problems.append(
+                        f"TOO_MANY: related_commands has {len(related)} items (max 5)"
+                    )
+                # Self-reference check only inside the list branch: on a null
+                # value `name in None` raises, and on a string it would
+                # false-positive via substring matching.
+                if "name" in meta and meta["name"] in related:
+                    problems.append("CIRCULAR: related_commands includes self")
+
+        if "tags" in meta:
+            if not isinstance(meta["tags"], list):
+                problems.append("INVALID: tags must be a list")
+            elif len(meta["tags"]) > 5:
+                problems.append(
+                    f"TOO_MANY: tags has {len(meta['tags'])} items (max 5)"
+                )
+
+        # Check dates
+        if "last_reviewed" in meta and meta["last_reviewed"]:
+            try:
+                # str(): an unquoted YAML date parses to a datetime.date,
+                # whose str() is already YYYY-MM-DD.
+                reviewed = str(meta["last_reviewed"])
+                match = LAST_REVIEWED_RE.fullmatch(reviewed)
+                if match is None:
+                    raise ValueError(reviewed)
+                days_old = (today - date(*map(int, match.groups()))).days
+                if days_old > 90:
+                    self.warnings.append(
+                        f"{filename}: last_reviewed is {days_old} days old"
+                    )
+            except (ValueError, TypeError):
+                problems.append(
+                    "INVALID: last_reviewed date format (use YYYY-MM-DD)"
+                )
+
+        return problems
 
     def validate_metadata(self) -> Dict[str, List[str]]:
         """Validate all metadata against schema.
@@ -98,95 +384,27 @@ class PlaybookEvolutionEngine:
         Returns: {filename: [list of validation errors]}
         """
         issues = defaultdict(list)
+        # One clock reading for the run keeps every "days old" figure consistent
+        today = datetime.now().date()
 
         for filename, cmd in self.commands.items():
             if cmd["metadata"] is None:
                 issues[filename].append("MISSING: No YAML front-matter")
                 continue
-
-            meta = cmd["metadata"]
-
-            # Check required fields. 'tags' is optional (Q2 2026: aligned to
-            # reality -- no command carries it; mdbook indexes title/category;
-            # validated below only when present). See .playbook-metadata-schema.yaml.
-            required = ["name", "title", "category", "difficulty", "model_hint",
-                       "execution_pattern", "related_commands", "last_reviewed"]
-            for field in required:
-                if field not in meta:
-                    issues[filename].append(f"MISSING: Required field '{field}'")
-
-            # Validate field values
-            if "name" in meta:
-                expected_name = filename.replace(".md", "")
-                if meta["name"] != expected_name:
-                    issues[filename].append(
-                        f"MISMATCH: name='{meta['name']}' but filename is '{expected_name}'"
-                    )
-
-            if "category" in meta:
-                valid_categories = ["core", "planning", "development", "deployment",
-                                   "reviews", "repo", "people", "templates", "utilities"]
-                if meta["category"] not in valid_categories:
-                    issues[filename].append(f"INVALID: category='{meta['category']}'")
-
-            if "difficulty" in meta:
-                valid_difficulties = ["beginner", "intermediate", "advanced", "expert"]
-                if meta["difficulty"] not in valid_difficulties:
-                    issues[filename].append(f"INVALID: difficulty='{meta['difficulty']}'")
-
-            if "model_hint" in meta:
-                valid_models = ["haiku", "sonnet", "opus"]
-                if meta["model_hint"] not in valid_models:
-                    issues[filename].append(f"INVALID: model_hint='{meta['model_hint']}'")
-
-            if "related_commands" in meta:
-                related = meta["related_commands"]
-                if not isinstance(related, list):
-                    issues[filename].append("INVALID: related_commands must be a list")
-                else:
-                    if len(related) > 5:
-                        issues[filename].append(
-                            f"TOO_MANY: related_commands has {len(related)} items (max 5)"
-                        )
-                    # Self-reference check only inside the list branch: on a null
-                    # value `name in None` raises, and on a string it would
-                    # false-positive via substring matching.
-                    if "name" in meta and meta["name"] in related:
-                        issues[filename].append("CIRCULAR: related_commands includes self")
-
-            if "tags" in meta:
-                if not isinstance(meta["tags"], list):
-                    issues[filename].append("INVALID: tags must be a list")
-                elif len(meta["tags"]) > 5:
-                    issues[filename].append(
-                        f"TOO_MANY: tags has {len(meta['tags'])} items (max 5)"
-                    )
-
-            # Check dates
-            if "last_reviewed" in meta and meta["last_reviewed"]:
-                try:
-                    # str(): an unquoted YAML date parses to a datetime.date,
-                    # whose str() is already YYYY-MM-DD. Without it,
-                    # strptime(date, ...) raises TypeError -- not caught below --
-                    # and crashes the whole validate run.
-                    review_date = datetime.strptime(str(meta["last_reviewed"]), "%Y-%m-%d")
-                    days_old = (datetime.now() - review_date).days
-                    if days_old > 90:
-                        self.warnings.append(
-                            f"{filename}: last_reviewed is {days_old} days old"
-                        )
-                except (ValueError, TypeError):
-                    issues[filename].append(
-                        "INVALID: last_reviewed date format (use YYYY-MM-DD)"
-                    )
+            problems = self._validate_command(filename, cmd["metadata"], today)
+            if problems:
+                issues[filename].extend(problems)
 
         return issues
 
     def generate_command_index(self) -> str:
         """Generate command index markdown grouped by category."""
-        index = "# Command Index\n\n"
-        index += "Auto-generated from command metadata. Last updated: " + \
-                datetime.now().strftime("%Y-%m-%d") + "\n\n"
+        # Collected as parts and joined once, rather than grown with +=
+        parts = [
+            "# Command Index\n\n",
+            "Auto-generated from command metadata. Last updated: ",
+            datetime.now().strftime("%Y-%m-%d"), "\n\n",
+        ]
 
         # Group by category
         by_category = defaultdict(list)
@@ -196,28 +414,25 @@ class PlaybookEvolutionEngine:
                 by_category[category].append((filename, cmd["metadata"]))
 
         # Sort categories in preferred order
-        category_order = ["core", "planning", "development", "deployment", "reviews",
-                         "repo", "people", "templates", "utilities"]
-
-        for category in category_order:
+        for category in CATEGORY_ORDER:
             if category not in by_category:
                 continue
 
-            index += f"## {category.title()}\n\n"
+            parts.append(f"## {category.title()}\n\n")
             for filename, meta in sorted(by_category[category]):
                 name = meta.get("name", filename)
                 title = meta.get("title", name)
                 summary = meta.get("summary", "")
                 difficulty = meta.get("difficulty", "")
 
-                index += f"- **[`{name}`]({name})** "
+                parts.append(f"- **[`{name}`]({name})** ")
                 if difficulty:
-                    index += f"_{difficulty}_ "
-                index += f"— {summary}\n"
+                    parts.append(f"_{difficulty}_ ")
+                parts.append(f"— {summary}\n")
 
-            index += "\n"
+            parts.append("\n")
 
-        return index
+        return "".join(parts)
 
     def generate_model_distribution(self) -> Dict[str, int]:
         """Analyze model usage across all commands."""
@@ -237,6 +452,31 @@ class PlaybookEvolutionEngine:
                 breakdown[category] += 1
         return dict(breakdown)
 
+    def _scan_commands(self) -> Tuple[Dict[str, List[str]], Dict[str, int], Dict[str, int]]:
+        """Validate and tally models/categories in one pass over self.commands.
+
+        Same results as validate_metadata(), generate_model_distribution()
+        and generate_category_breakdown(), without walking the dict three times.
+        """
+        issues = defaultdict(list)
+        model_dist = defaultdict(int)
+        category_breakdown = defaultdict(int)
+        today = datetime.now().date()
+
+        for filename, cmd in self.commands.items():
+            meta = cmd["metadata"]
+            if meta is None:
+                issues[filename].append("MISSING: No YAML front-matter")
+                continue
+            problems = self._validate_command(filename, meta, today)
+            if problems:
+                issues[filename].extend(problems)
+            if meta:
+                model_dist[meta.get("model_hint", "unknown")] += 1
+                category_breakdown[meta.get("category", "unknown")] += 1
+
+        return issues, dict(model_dist), dict(category_breakdown)
+
     def analyze(self) -> Dict:
         """Analyze current state."""
         self.load_all_commands()
@@ -244,11 +484,9 @@ class PlaybookEvolutionEngine:
         total_commands = len(self.commands)
         with_metadata = sum(1 for c in self.commands.values() if c["has_metadata"])
 
-        validation_issues = self.validate_metadata()
+        validation_issues, model_dist, category_breakdown = self._scan_commands()
         total_issues = sum(len(v) for v in validation_issues.values())
-
-        model_dist = self.generate_model_distribution()
-        category_breakdown = self.generate_category_breakdown()
+        self._save_cache()
 
         return {
             "timestamp": datetime.now().isoformat(),
@@ -314,8 +552,7 @@ class PlaybookEvolutionEngine:
     def save_analysis(self, analysis: Dict, filepath: str = "todos/evolution-analysis.json"):
         """Save analysis results to JSON."""
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, 'w') as f:
-            json.dump(analysis, f, indent=2)
+        Path(filepath).write_bytes(json_dumps(analysis))
         print(f"Analysis saved to {filepath}")
 
 
@@ -15,15 +15,72 @@ Output:
     extraction_report.txt (if --report flag used)
 """
 
-import json
+import os
 import re
 import sys
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Tuple
 import logging
 
-from playbook_utils import setup_logger, is_skill_file
+from playbook_utils import iter_command_files, json_dumps, setup_logger, is_skill_file
+
+# Patterns are compiled once here rather than looked up per call per file
+TITLE_RE = re.compile(r"^#\s+([^#\n]+)", re.MULTILINE)
+BOLD_RE = re.compile(r"\*\*|__")
+LEADING_MARKUP_RE = re.compile(r"^[>*_`\-]+\s*")
+INLINE_MARKUP_RE = re.compile(r"\*\*|\*|__|`")
+
+TIERS = ("XS", "S", "M", "L")
+# "Tier: X" or "Tier: [X, Y]"; XS comes before S so it is not read as S
+TIER_EXPLICIT_RE = re.compile(r"[Tt]ier:\s*\[?((?:XS|S|M|L)\b(?:\s*,\s*(?:XS|S|M|L)\b)*)")
+TIER_NAME_RE = re.compile(r"XS|S|M|L")
+TIER_ROW_RE = re.compile(r"\|\s*\*\*(XS|S|M|L)\*\*\s*\|")
+# Complexity keywords in one pass; the matching group's name is the tier.
+# Matched against lowercased text, which beats case-folding under IGNORECASE.
+TIER_KEYWORD_RE = re.compile(
+    r"\b(?:(?P<XS>simple|straightforward|trivial|minimal)"
+    r"|(?P<M>medium|moderate|standard)"
+    r"|(?P<L>large|complex|substantial|significant))\b"
+)
+TIER_KEYWORD_COUNT = len(TIER_KEYWORD_RE.groupindex)
+
+PB_REF_RE = re.compile(r"/pb-[\w-]+")
+# A heading is any "##" followed by whitespace (so h3 and deeper count too); its
+# body runs to the next "##" anywhere. Zero-width, so no heading is skipped.
+SECTION_HEADING_RE = re.compile(r"(?=##\s+(?!#)(.*)\n)")
+NEXT_STEPS_HEADINGS = frozenset({"next steps", "then", "workflow", "after"})
+PREREQUISITES_HEADINGS = frozenset({"prerequisites", "before", "pre-start"})
+WHEN_TO_USE_HEADINGS = frozenset({"when to use"})
+
+# (lowercased heading, body start, body end) per section, in document order
+Sections = List[Tuple[str, int, int]]
+# Every /pb-* reference in a document as parallel (offsets, tokens) lists
+PbRefs = Tuple[List[int], List[str]]
+
+# Matched against lowercased "When to Use" text; first hit wins
+FREQUENCY_RES = tuple((freq, re.compile(pattern)) for freq, pattern in (
+    ("daily", r"\bdaily\b|\beveryday\b"),
+    ("weekly", r"\bweekly\b|\bweek\b"),
+    ("start-of-feature", r"\bstart of feature\b|\bstart of\b.*\bfeature\b|\bbeginning of feature\b"),
+    ("per-iteration", r"\bper iteration\b|\beach iteration\b|\bevery iteration\b"),
+    ("per-pr", r"\bper pr\b|\bbefore.*pr\b|\beach.*pr\b"),
+    ("pre-release", r"\brelease\b|\bpre-release\b|\bdeployment\b"),
+    ("on-incident", r"\bincident\b|\bhotfix\b|\bemergency\b"),
+    ("one-time", r"\bone-time\b|\binitial setup\b|\bfirst time\b"),
+))
+
+# The captures keep their original case, so rather than lowercase the text
+# the few case-insensitive letters are spelled out; the classes are exactly
+# what IGNORECASE matched (including U+017F, which folds to "s")
+DECISION_RE = re.compile(r"([^→\n]+?)\s*→\s*(?:[Uu][Ssſ][Ee]\s+)?(/[Pp][Bb]-[\w-]+)")
+USE_WHEN_RE = re.compile(r"use\s+(?:when|if):\s*([^\n]+)", re.IGNORECASE)
+H2_RE = re.compile(r"^##\s+([^#\n]+)", re.MULTILINE)
+SLUG_STRIP_RE = re.compile(r"[^\w\s-]")
+SLUG_SPACE_RE = re.compile(r"\s+")
+CHECKLIST_RE = re.compile(r"\[\s*\]")
 
 
 class PlaybookMetadataExtractor:
@@ -44,6 +101,12 @@ class PlaybookMetadataExtractor:
         # Cache of all valid commands (for cross-validation)
         self.valid_commands: Set[str] = set()
 
+        # File text read during discovery, handed on so extraction never re-reads
+        self._contents: Dict[Path, str] = {}
+
+        # One timestamp per run, shared by every record (set by extract_all)
+        self._extraction_timestamp: Optional[str] = None
+
         # Extraction results
         self.metadata: Dict[str, Dict[str, Any]] = {}
         self.warnings: List[Dict[str, str]] = []
@@ -71,9 +134,10 @@ class PlaybookMetadataExtractor:
         self.logger.info(f"Valid commands: {sorted(self.valid_commands)}")
 
         # Step 3: Extract metadata from each command
+        self._extraction_timestamp = datetime.now(timezone.utc).isoformat()
         for file_path in sorted(command_files):
             try:
-                self._extract_command_metadata(file_path)
+                self._extract_command_metadata(file_path, self._contents.pop(file_path, None))
             except Exception as e:
                 self.logger.error(f"Error extracting {file_path}: {e}")
                 self.errors.append(
@@ -99,19 +163,24 @@ class PlaybookMetadataExtractor:
             self.logger.error(f"Commands directory not found: {self.commands_dir}")
             return []
 
-        all_files = sorted(self.commands_dir.rglob("pb-*.md"))
+        all_files = sorted(map(Path, iter_command_files(self.commands_dir)))
 
         # Filter out skill files (AI prompt templates, not user commands)
         regular_commands = []
         skill_files = []
 
-        for file_path in all_files:
+        # Reads are blocking I/O; overlap them, then classify in path order
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool:
+            reads = [pool.submit(self._read_file, file_path) for file_path in all_files]
+
+        for file_path, read in zip(all_files, reads):
             try:
-                content = self._read_file(file_path)
+                content = read.result()
                 if is_skill_file(content):
                     skill_files.append(file_path.stem)
                 else:
                     regular_commands.append(file_path)
+                    self._contents[file_path] = content
             except Exception as e:
                 self.logger.warning(f"Could not determine file type for {file_path}: {e}")
                 regular_commands.append(file_path)  # Default to regular command
@@ -129,15 +198,22 @@ class PlaybookMetadataExtractor:
         """Extract category from directory structure."""
         return file_path.parent.name
 
+    def _timestamp(self) -> str:
+        """The run's extraction timestamp, or now when called outside extract_all."""
+        return self._extraction_timestamp or datetime.now(timezone.utc).isoformat()
+
     def _read_file(self, file_path: Path) -> str:
         """Read markdown file content."""
         return file_path.read_text(encoding="utf-8")
 
-    def _extract_command_metadata(self, file_path: Path) -> None:
-        """Extract metadata from a single command file."""
-        content = self._read_file(file_path)
+    def _extract_command_metadata(self, file_path: Path, content: Optional[str] = None) -> None:
+        """Extract metadata from a single command file (read here unless given)."""
+        if content is None:
+            content = self._read_file(file_path)
         command = self._extract_command_name(file_path)
         category = self._extract_category(file_path)
+        sections = self._split_sections(content)
+        pb_refs = self._find_pb_refs(content)
 
         metadata = {
             "command": command,
@@ -145,17 +221,17 @@ class PlaybookMetadataExtractor:
             "title": self._extract_title(content),
             "purpose": self._extract_purpose(content),
             "tier": self._extract_tier(content),
-            "related_commands": self._extract_related_commands(content),
-            "next_steps": self._extract_next_steps(content),
-            "prerequisites": self._extract_prerequisites(content),
-            "frequency": self._extract_frequency(content),
-            "decision_context": self._extract_decision_context(content),
+            "related_commands": self._extract_related_commands(content, pb_refs),
+            "next_steps": self._extract_next_steps(content, sections, pb_refs),
+            "prerequisites": self._extract_prerequisites(content, sections, pb_refs),
+            "frequency": self._extract_frequency(content, sections),
+            "decision_context": self._extract_decision_context(content, sections),
             "sections": self._extract_sections(content),
             "has_examples": self._extract_has_examples(content),
             "has_checklist": self._extract_has_checklist(content),
             "extraction_metadata": {
                 "source_file": str(file_path.relative_to(self.repo_root)),
-                "extraction_date": datetime.now(timezone.utc).isoformat(),
+                "extraction_date": self._timestamp(),
                 "extractor_version": "1.0",
             },
         }
@@ -181,11 +257,11 @@ class PlaybookMetadataExtractor:
                 content = content[yaml_end + 5:]  # +5 to skip \n---\n
 
         # Extract title from first h1 heading
-        match = re.search(r"^#\s+([^#\n]+)", content, re.MULTILINE)
+        match = TITLE_RE.search(content)
         if match:
             title = match.group(1).strip()
             # Remove markdown syntax
-            title = re.sub(r"\*\*|__", "", title)
+            title = BOLD_RE.sub("", title)
             return title
         return None
 
@@ -216,9 +292,9 @@ class PlaybookMetadataExtractor:
                 if line and not line.startswith("#") and not line.startswith("---"):
                     # Return first meaningful line, removing markdown if needed
                     # Remove leading markdown syntax (>, *, **, etc.)
-                    line = re.sub(r"^[>*_`\-]+\s*", "", line)
+                    line = LEADING_MARKUP_RE.sub("", line)
                     # Clean up inline markdown markers
-                    line = re.sub(r"\*\*|\*|__|`", "", line)
+                    line = INLINE_MARKUP_RE.sub("", line)
                     return line if line else None
 
         return None
@@ -231,68 +307,96 @@ class PlaybookMetadataExtractor:
         tiers = set()
 
         # Pattern 1: Explicit "Tier: X" or "Tier: [X, Y]"
-        tier_matches = re.findall(
-            r"[Tt]ier:\s*\[?([XS]|M|[L]?)(?:\s*,\s*([XS]|M|[L]?))*\]?", content
-        )
-        if tier_matches:
-            for match in tier_matches:
-                for item in match:
-                    if item and item in {"XS", "S", "M", "L"}:
-                        tiers.add(item)
+        for tier_list in TIER_EXPLICIT_RE.findall(content):
+            tiers.update(TIER_NAME_RE.findall(tier_list))
 
         # Pattern 2: Tier table rows
-        tier_rows = re.findall(r"\|\s*\*\*([XS]|M|L)\*\*\s*\|", content)
-        for row_tier in tier_rows:
-            if row_tier in {"XS", "S", "M", "L"}:
-                tiers.add(row_tier)
-
-        # Pattern 3: Complexity keywords
-        if re.search(
-            r"\b(simple|straightforward|trivial|minimal)\b",
-            content,
-            re.IGNORECASE,
-        ):
-            tiers.add("XS")
-        if re.search(r"\b(medium|moderate|standard)\b", content, re.IGNORECASE):
-            tiers.add("M")
-        if re.search(
-            r"\b(large|complex|substantial|significant)\b", content, re.IGNORECASE
-        ):
-            tiers.add("L")
+        tiers.update(TIER_ROW_RE.findall(content))
+
+        # Pattern 3: Complexity keywords, stopping once every keyword tier is seen
+        keyword_tiers = set()
+        for match in TIER_KEYWORD_RE.finditer(content.lower()):
+            keyword_tiers.add(match.lastgroup)
+            if len(keyword_tiers) == TIER_KEYWORD_COUNT:
+                break
+        tiers |= keyword_tiers
 
         if tiers:
-            return sorted(list(tiers), key=lambda x: {"XS": 0, "S": 1, "M": 2, "L": 3}[x])
+            return sorted(tiers, key=TIERS.index)
         return None
 
-    def _extract_related_commands(self, content: str) -> List[str]:
+    def _find_pb_refs(self, content: str) -> PbRefs:
+        """Scan content once for /pb-* references, keeping each one's offset."""
+        offsets, tokens = [], []
+        for match in PB_REF_RE.finditer(content):
+            offsets.append(match.start())
+            tokens.append(match.group(0))
+        return offsets, tokens
+
+    def _pb_refs_in(self, pb_refs: PbRefs, span: Tuple[int, int]) -> List[str]:
+        """The references that start inside span, in document order."""
+        offsets, tokens = pb_refs
+        return tokens[bisect_left(offsets, span[0]):bisect_left(offsets, span[1])]
+
+    def _extract_related_commands(
+        self, content: str, pb_refs: Optional[PbRefs] = None
+    ) -> List[str]:
         """
         Extract all /pb-* command references from content.
         Returns sorted unique list, excluding command's own name.
         """
+        if pb_refs is None:
+            pb_refs = self._find_pb_refs(content)
+
         # Find all /pb-<name> references
-        commands = re.findall(r"/pb-[\w-]+", content)
+        commands = pb_refs[1]
 
         # Remove duplicates and sort
         unique_commands = sorted(set(commands))
 
         return unique_commands
 
-    def _extract_next_steps(self, content: str) -> Optional[List[str]]:
+    def _split_sections(self, content: str) -> Sections:
+        """
+        Split content once into (lowercased heading, body start, body end), in
+        document order. The section extractors look their heading up here
+        instead of each re-scanning the whole file.
+        """
+        sections = []
+        for match in SECTION_HEADING_RE.finditer(content):
+            start = match.end(1) + 1
+            end = content.find("##", start)
+            if end == -1:
+                end = len(content)
+            sections.append((match.group(1).strip().lower(), start, end))
+        return sections
+
+    def _find_section(self, sections: Sections, headings: frozenset) -> Optional[Tuple[int, int]]:
+        """Return the body span of the first section titled with any of headings."""
+        return next(
+            ((start, end) for heading, start, end in sections if heading in headings), None
+        )
+
+    def _extract_next_steps(
+        self, content: str, sections: Optional[Sections] = None, pb_refs: Optional[PbRefs] = None
+    ) -> Optional[List[str]]:
         """
         Extract workflow sequence from "Next Steps" section or workflow patterns.
         Order indicates sequence (important).
         """
+        if sections is None:
+            sections = self._split_sections(content)
+
         # Look for "Next Steps" or "Workflow" section
-        sections_pattern = r"##\s+(?:Next Steps|Then|Workflow|After)\s*\n(.*?)(?=##|\Z)"
-        match = re.search(sections_pattern, content, re.IGNORECASE | re.DOTALL)
+        span = self._find_section(sections, NEXT_STEPS_HEADINGS)
 
-        if not match:
+        if span is None:
             return None
-
-        section_text = match.group(1)
+        if pb_refs is None:
+            pb_refs = self._find_pb_refs(content)
 
         # Extract /pb-* references maintaining order
-        commands = re.findall(r"/pb-[\w-]+", section_text)
+        commands = self._pb_refs_in(pb_refs, span)
 
         # Remove duplicates while preserving order
         seen = set()
@@ -304,21 +408,25 @@ class PlaybookMetadataExtractor:
 
         return unique_commands if unique_commands else None
 
-    def _extract_prerequisites(self, content: str) -> Optional[List[str]]:
+    def _extract_prerequisites(
+        self, content: str, sections: Optional[Sections] = None, pb_refs: Optional[PbRefs] = None
+    ) -> Optional[List[str]]:
         """
         Extract required setup steps from Prerequisites section.
         """
+        if sections is None:
+            sections = self._split_sections(content)
+
         # Look for "Prerequisites" or "Before" section
-        sections_pattern = r"##\s+(?:Prerequisites|Before|Pre-Start)\s*\n(.*?)(?=##|\Z)"
-        match = re.search(sections_pattern, content, re.IGNORECASE | re.DOTALL)
+        span = self._find_section(sections, PREREQUISITES_HEADINGS)
 
-        if not match:
+        if span is None:
             return None
-
-        section_text = match.group(1)
+        if pb_refs is None:
+            pb_refs = self._find_pb_refs(content)
 
         # Extract /pb-* references
-        commands = re.findall(r"/pb-[\w-]+", section_text)
+        commands = self._pb_refs_in(pb_refs, span)
 
         # Remove duplicates while preserving order
         seen = set()
@@ -330,67 +438,55 @@ class PlaybookMetadataExtractor:
 
         return unique_commands if unique_commands else None
 
-    def _extract_frequency(self, content: str) -> Optional[str]:
+    def _extract_frequency(
+        self, content: str, sections: Optional[Sections] = None
+    ) -> Optional[str]:
         """
         Extract usage frequency from "When to Use" section.
         Returns one of: daily, weekly, start-of-feature, per-iteration, per-pr,
         pre-release, on-incident, one-time, as-needed
         """
+        if sections is None:
+            sections = self._split_sections(content)
+
         # Look for "When to Use" section
-        when_match = re.search(
-            r"##\s+When to Use\s*\n(.*?)(?=##|\Z)", content, re.IGNORECASE | re.DOTALL
-        )
+        span = self._find_section(sections, WHEN_TO_USE_HEADINGS)
 
-        if not when_match:
+        if span is None:
             return "as-needed"
 
-        when_text = when_match.group(1).lower()
+        when_text = content[span[0]:span[1]].lower()
 
         # Check for frequency patterns
-        frequency_patterns = {
-            "daily": r"\bdaily\b|\beveryday\b",
-            "weekly": r"\bweekly\b|\bweek\b",
-            "start-of-feature": r"\bstart of feature\b|\bstart of\b.*\bfeature\b|\bbeginning of feature\b",
-            "per-iteration": r"\bper iteration\b|\beach iteration\b|\bevery iteration\b",
-            "per-pr": r"\bper pr\b|\bbefore.*pr\b|\beach.*pr\b",
-            "pre-release": r"\brelease\b|\bpre-release\b|\bdeployment\b",
-            "on-incident": r"\bincident\b|\bhotfix\b|\bemergency\b",
-            "one-time": r"\bone-time\b|\binitial setup\b|\bfirst time\b",
-        }
-
-        for freq, pattern in frequency_patterns.items():
-            if re.search(pattern, when_text):
+        for freq, pattern in FREQUENCY_RES:
+            if pattern.search(when_text):
                 return freq
 
         return "as-needed"
 
-    def _extract_decision_context(self, content: str) -> Optional[Dict[str, str]]:
+    def _extract_decision_context(
+        self, content: str, sections: Optional[Sections] = None
+    ) -> Optional[Dict[str, str]]:
         """
         Extract decision rules and conditions.
         Returns structured decision logic or None.
         """
+        if sections is None:
+            sections = self._split_sections(content)
+
         decision_context = {}
 
         # Look for decision patterns like "Feature? → Use /pb-X"
-        decision_patterns = re.findall(
-            r"([^→\n]+?)\s*→\s*(?:use\s+)?(/pb-[\w-]+)",
-            content,
-            re.IGNORECASE,
-        )
+        decision_patterns = DECISION_RE.findall(content)
 
         for condition, command in decision_patterns:
             decision_context[condition.strip()] = command
 
         # Look for "When to Use" conditionals
-        when_match = re.search(
-            r"##\s+When to Use\s*\n(.*?)(?=##|\Z)", content, re.IGNORECASE | re.DOTALL
-        )
-        if when_match:
-            when_text = when_match.group(1)
+        span = self._find_section(sections, WHEN_TO_USE_HEADINGS)
+        if span is not None:
             # Extract "Use when:", "Use if:", patterns
-            when_conditions = re.findall(
-                r"use\s+(?:when|if):\s*([^\n]+)", when_text, re.IGNORECASE
-            )
+            when_conditions = USE_WHEN_RE.findall(content, span[0], span[1])
             for cond in when_conditions:
                 decision_context[f"use_when_{len(decision_context)}"] = cond.strip()
 
@@ -398,25 +494,26 @@ class PlaybookMetadataExtractor:
 
     def _extract_sections(self, content: str) -> List[str]:
         """Extract all ## section headings as slugified names."""
-        sections = re.findall(r"^##\s+([^#\n]+)", content, re.MULTILINE)
+        sections = H2_RE.findall(content)
 
         # Slugify section names
         slugified = []
         for section in sections:
             slug = section.lower()
-            slug = re.sub(r"[^\w\s-]", "", slug)  # Remove special chars
-            slug = re.sub(r"\s+", "-", slug)  # Replace spaces with hyphens
+            slug = SLUG_STRIP_RE.sub("", slug)  # Remove special chars
+            slug = SLUG_SPACE_RE.sub("-", slug)  # Replace spaces with hyphens
             slugified.append(slug)
 
         return slugified
 
     def _extract_has_examples(self, content: str) -> bool:
         """Check if content includes code examples (``` blocks)."""
-        return bool(re.search(r"```", content))
+        return "```" in content
 
     def _extract_has_checklist(self, content: str) -> bool:
         """Check if content includes checklists ([ ] syntax)."""
-        return bool(re.search(r"\[\s*\]", content))
+        # \s* rules out a plain substring test, but no "[" at all settles it
+        return "[" in content and CHECKLIST_RE.search(content) is not None
 
     def _calculate_confidence_scores(
         self, metadata: Dict[str, Any], content: str
@@ -585,7 +682,7 @@ class PlaybookMetadataExtractor:
 
         return {
             "metadata_version": "1.0",
-            "extraction_date": datetime.now(timezone.utc).isoformat(),
+            "extraction_date": self._timestamp(),
             "total_commands": total_commands,
             "commands": self.metadata,
             "categories": categories,
@@ -603,8 +700,7 @@ class PlaybookMetadataExtractor:
     def save_metadata(self, output_path: Path) -> None:
         """Save complete metadata to JSON file."""
         metadata_to_save = getattr(self, "complete_metadata", None) or self.metadata
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(metadata_to_save, f, indent=2)
+        Path(output_path).write_bytes(json_dumps(metadata_to_save))
         self.logger.info(f"Metadata saved to {output_path}")
 
 
@@ -7,10 +7,17 @@ Consolidates common patterns: logging, metadata loading, constants, validation.
 
 import json
 import logging
+import os
 import re
 import sys
 from pathlib import Path
-from typing import Any, Dict, Optional, Set
+from typing import Any, Dict, Iterator, Optional, Set
+
+try:
+    import orjson
+except ImportError:
+    # Optional speedup; the stdlib json module is the fallback
+    orjson = None
 
 
 def setup_logger(logger_name: str, verbose: bool = False) -> logging.Logger:
@@ -28,6 +35,67 @@ def setup_logger(logger_name: str, verbose: bool = False) -> logging.Logger:
     return logger
 
 
+def json_loads(data: bytes) -> Any:
+    """Parse JSON bytes, with orjson when installed.
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch
+    the stdlib exception either way.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any, indent: bool = True) -> bytes:
+    """Encode to UTF-8 JSON bytes (2-space indent unless indent=False).
+
+    Uses orjson when installed. For str-keyed dicts, lists, strings, ints,
+    bools and None both paths emit the same bytes: raw UTF-8 rather than
+    \\uXXXX escapes, and no spaces in the compact form. They still differ
+    elsewhere: orjson raises on non-str keys (stdlib converts them), encodes
+    date/datetime (stdlib raises), writes NaN/Infinity as null, and may
+    format some floats differently.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write bytes to a sibling temp file, then os.replace it over path.
+
+    Readers see the old file or the new one, never a partial write.
+    """
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def iter_command_files(root) -> Iterator[str]:
+    """Yield pb-*.md paths under root as plain strings (no Path per entry).
+
+    os.scandir gets each entry's type from the directory listing, so unlike
+    Path.glob("**/pb-*.md") nothing is stat'd per entry. A missing root yields
+    nothing, as glob would.
+    """
+    try:
+        entries = os.scandir(root)
+    except FileNotFoundError:
+        return
+    with entries:
+        for entry in entries:
+            if entry.is_dir():
+                yield from iter_command_files(entry.path)
+            elif entry.name.startswith("pb-") and entry.name.endswith(".md"):
+                yield entry.path
+
+
 def load_metadata(metadata_file: Path) -> Optional[Dict[str, Any]]:
     """Load metadata from JSON file with consistent error handling."""
     if not metadata_file.exists():
@@ -35,8 +103,7 @@ def load_metadata(metadata_file: Path) -> Optional[Dict[str, Any]]:
         return None
 
     try:
-        with open(metadata_file, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return json_loads(metadata_file.read_bytes())
     except json.JSONDecodeError as e:
         logging.error(f"Invalid JSON in metadata file: {e}")
         return None
@@ -58,16 +125,18 @@ def load_json(json_file: Path) -> Optional[Dict[str, Any]]:
         return None
 
 
+# Opening words of a skill file's first line
+SKILL_FIRST_LINE_RE = re.compile(r"(?:You are|You will|Lets|You should)\s")
+
+
 def is_skill_file(content: str) -> bool:
     """Check if file is a skill file (AI prompt template)."""
-    skill_indicators = [
-        r"^You are\s",
-        r"^You will\s",
-        r"^Lets\s",
-        r"^You should\s",
-    ]
-    first_line = content.split("\n")[0].strip()
-    return any(re.match(indicator, first_line) for indicator in skill_indicators)
+    # Only the first line matters: partition stops at the first newline
+    # instead of splitting the whole file
+    first_line = content.partition("\n")[0].strip()
+    if not first_line.startswith(("You", "Lets")):
+        return False
+    return SKILL_FIRST_LINE_RE.match(first_line) is not None
 
 
 def normalize_tier(tier: Any) -> str:
@@ -12,6 +12,7 @@ Tests cover:
 """
 
 import json
+import subprocess
 import tempfile
 from pathlib import Path
 from unittest import mock
@@ -21,6 +22,7 @@ import pytest
 # Import the analyzer
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+import analyze_playbook_context
 from analyze_playbook_context import PlaybookContextAnalyzer
 
 
@@ -106,6 +108,14 @@ def metadata_file(sample_metadata, tmp_path):
     return metadata_path
 
 
+def git_outputs(**by_subcommand):
+    """Mock side effect returning canned output per git subcommand.
+
+    The analyzer runs git calls concurrently, so call order isn't fixed.
+    """
+    return lambda args: by_subcommand[args[1]]
+
+
 class TestPlaybookContextAnalyzerInit:
     """Test initialization of PlaybookContextAnalyzer."""
 
@@ -144,6 +154,37 @@ class TestPlaybookContextAnalyzerInit:
         assert success is False
         assert len(analyzer.errors) > 0
 
+    @pytest.mark.parametrize("use_orjson", [True, False], ids=["orjson", "stdlib"])
+    def test_load_metadata_json_backends(self, use_orjson, metadata_file, tmp_path, monkeypatch):
+        """Test that metadata loads, and bad JSON fails cleanly, with or without orjson."""
+        import playbook_utils
+
+        if not use_orjson:
+            monkeypatch.setattr(playbook_utils, "orjson", None)
+        elif playbook_utils.orjson is None:
+            pytest.skip("orjson not installed")
+
+        assert len(playbook_utils.load_metadata(metadata_file)["commands"]) == 8
+        bad_file = tmp_path / "bad.json"
+        bad_file.write_text("{invalid json}")
+        assert playbook_utils.load_metadata(bad_file) is None
+
+    def test_load_metadata_reuses_unchanged_parse(self, metadata_file, sample_metadata):
+        """Test that an unchanged metadata file is parsed once, and re-read after an edit."""
+        with mock.patch(
+            "analyze_playbook_context.load_metadata", wraps=analyze_playbook_context.load_metadata
+        ) as loader:
+            PlaybookContextAnalyzer(metadata_file=metadata_file).load_metadata()
+            PlaybookContextAnalyzer(metadata_file=metadata_file).load_metadata()
+            assert loader.call_count == 1
+
+            del sample_metadata["commands"]["pb-start"]
+            metadata_file.write_text(json.dumps(sample_metadata, indent=2))
+            analyzer = PlaybookContextAnalyzer(metadata_file=metadata_file)
+            analyzer.load_metadata()
+            assert loader.call_count == 2
+            assert "pb-start" not in analyzer.commands
+
 
 class TestGitStateAnalysis:
     """Test git state analysis."""
@@ -151,13 +192,11 @@ class TestGitStateAnalysis:
     @mock.patch("analyze_playbook_context.PlaybookContextAnalyzer._run_git_command")
     def test_analyze_git_state_feature_branch(self, mock_git, metadata_file):
         """Test git state analysis on feature branch."""
-        mock_git.side_effect = [
-            "feature/new-feature\n",  # branch
-            "M  file1.py\n?? file2.py\n",  # status
-            "file2.py\n",  # staged
-            "commit1\ncommit2\ncommit3\n",  # log
-            "file1.py\nfile2.py\n",  # diff
-        ]
+        mock_git.side_effect = git_outputs(
+            status="# branch.oid abc123\0# branch.head feature/new-feature\0"
+            "1 M. N... 100644 100644 100644 abc abc file1.py\0? file2.py\0",
+            log="commit1\ncommit2\ncommit3\n",
+        )
 
         analyzer = PlaybookContextAnalyzer(metadata_file=metadata_file)
         analyzer.load_metadata()
@@ -171,13 +210,10 @@ class TestGitStateAnalysis:
     @mock.patch("analyze_playbook_context.PlaybookContextAnalyzer._run_git_command")
     def test_analyze_git_state_main_branch(self, mock_git, metadata_file):
         """Test git state analysis on main branch."""
-        mock_git.side_effect = [
-            "main\n",  # branch
-            "",  # status (clean)
-            "",  # staged
-            "commit1\n",  # log
-            "",  # diff
-        ]
+        mock_git.side_effect = git_outputs(
+            status="# branch.oid abc123\0# branch.head main\0",  # clean
+            log="commit1\n",
+        )
 
         analyzer = PlaybookContextAnalyzer(metadata_file=metadata_file)
         analyzer.load_metadata()
@@ -189,7 +225,7 @@ class TestGitStateAnalysis:
     @mock.patch("analyze_playbook_context.PlaybookContextAnalyzer._run_git_command")
     def test_analyze_git_state_no_changes(self, mock_git, metadata_file):
         """Test git state with no changes."""
-        mock_git.side_effect = ["feature/branch\n", "", "", "", ""]
+        mock_git.side_effect = git_outputs(status="# branch.head feature/branch\0", log="")
 
         analyzer = PlaybookContextAnalyzer(metadata_file=metadata_file)
         analyzer.load_metadata()
@@ -197,6 +233,83 @@ class TestGitStateAnalysis:
 
         assert len(git_state["changed_files"]) == 0
 
+    def test_parse_status_splits_staged_unstaged_untracked(self, metadata_file):
+        """Test porcelain v2 parsing of staged, unstaged, renamed and untracked entries."""
+        status = (
+            "# branch.oid abc123\0"
+            "# branch.head feature/x\0"
+            "1 M. N... 100644 100644 100644 abc abc staged.py\0"
+            "1 .M N... 100644 100644 100644 abc abc edited file.py\0"
+            "1 MM N... 100644 100644 100644 abc abc both.py\0"
+            "2 R. N... 100644 100644 100644 abc abc R100 new.py\0old.py\0"
+            "? notes.md\0"
+        )
+        analyzer = PlaybookContextAnalyzer(metadata_file=metadata_file)
+        branch, staged, unstaged, untracked = analyzer._parse_status(status)
+
+        assert branch == "feature/x"
+        assert staged == ["staged.py", "both.py", "new.py"]
+        assert unstaged == ["edited file.py", "both.py"]
+        assert untracked == ["notes.md"]
+
+    def test_run_git_command_uses_argv_without_shell(self, metadata_file):
+        """Test that git runs from an argv list, not through a shell."""
+        analyzer = PlaybookContextAnalyzer(metadata_file=metadata_file)
+        with mock.patch("analyze_playbook_context.subprocess.run") as mock_run:
+            mock_run.return_value = mock.Mock(stdout="out")
+            assert analyzer._run_git_command(["git", "log", "--oneline", "-10"]) == "out"
+
+        args, kwargs = mock_run.call_args
+        assert args[0] == ["git", "log", "--oneline", "-10"]
+        assert not kwargs.get("shell")
+
+    def test_parse_status_detached_head(self, metadata_file):
+        """Test that a detached HEAD yields no branch name."""
+        analyzer = PlaybookContextAnalyzer(metadata_file=metadata_file)
+        branch, _, _, _ = analyzer._parse_status("# branch.head (detached)\0")
+        assert branch == ""
+
+
+class TestAnalysisCache:
+    """Test reuse of analysis output across runs."""
+
+    def _git(self, tmp_path, status):
+        git_dir = tmp_path / "gitdir"
+        git_dir.mkdir(exist_ok=True)
+        return mock.Mock(
+            side_effect=git_outputs(
+                status=status,
+                log="commit1\n",
+                **{"rev-parse": f"{git_dir}\nabc123\n"},
+            )
+        )
+
+    def test_repeat_run_reuses_cached_output(self, metadata_file, tmp_path):
+        """Test that an unchanged repo skips git log on the second run."""
+        status = "# branch.head feature/x\0? new.py\0"
+        git = self._git(tmp_path, status)
+        with mock.patch.object(PlaybookContextAnalyzer, "_run_git_command", git):
+            first = PlaybookContextAnalyzer(metadata_file=metadata_file, cache=True).analyze()
+            second = PlaybookContextAnalyzer(metadata_file=metadata_file, cache=True).analyze()
+
+        assert first == second
+        log_calls = [c for c in git.call_args_list if c.args[0][1] == "log"]
+        assert len(log_calls) == 1
+
+    def test_worktree_change_invalidates_cache(self, metadata_file, tmp_path):
+        """Test that a different status output forces a fresh analysis."""
+        with mock.patch.object(
+            PlaybookContextAnalyzer, "_run_git_command", self._git(tmp_path, "# branch.head feature/x\0")
+        ):
+            clean = PlaybookContextAnalyzer(metadata_file=metadata_file, cache=True).analyze()
+        with mock.patch.object(
+            PlaybookContextAnalyzer, "_run_git_command", self._git(tmp_path, "# branch.head feature/x\0? new.py\0")
+        ):
+            dirty = PlaybookContextAnalyzer(metadata_file=metadata_file, cache=True).analyze()
+
+        assert "None (clean working directory)" in clean
+        assert "1 files changed" in dirty
+
 
 class TestWorkflowPhaseDetection:
     """Test workflow phase detection."""
@@ -279,6 +392,28 @@ class TestFileTypeIdentification:
         file_types = analyzer._identify_changed_file_types({"changed_files": files})
         assert len(file_types) >= 2  # At least source and tests
 
+    @pytest.mark.parametrize(
+        "path,expected",
+        [
+            ("README.md", "docs"),
+            ("guide.mdx", "docs"),  # ".md" is a substring match
+            ("README.md.orig", "docs"),
+            ("src/main.py", "source"),
+            ("src/Foo.PY", None),  # suffixes are case-sensitive
+            ("api.Dockerfile", "config"),  # config names are suffixes too
+            ("my-docker-compose.yml", "config"),
+            ("tests/foo.py", "tests"),  # path rules win over the suffix
+            ("docs/setup.py", "docs"),
+            (".github/workflows/test.yml", "ci"),
+            ("Makefile", None),
+        ],
+    )
+    def test_classification_rules(self, metadata_file, path, expected):
+        """Each path lands in exactly the category the rules give it."""
+        analyzer = PlaybookContextAnalyzer(metadata_file=metadata_file)
+        file_types = analyzer._identify_changed_file_types({"changed_files": [path]})
+        assert file_types == ({expected: [path]} if expected else {})
+
 
 class TestRecommendationGeneration:
     """Test recommendation generation."""
@@ -392,6 +527,21 @@ class TestConfidenceScoring:
         assert len(scored) == len(recommendations)
         assert scored[0]["command"] in [r["command"] for r in scored]
 
+    def test_rank_orders_by_priority_then_confidence(self, metadata_file):
+        """Test ranking: tier priority first, confidence breaks ties, missing confidence is 0.5."""
+        analyzer = PlaybookContextAnalyzer(metadata_file=metadata_file)
+        analyzer.load_metadata()
+
+        recommendations = [
+            {"command": "pb-cycle", "confidence": 0.90},  # L -> 2
+            {"command": "pb-unknown"},  # no metadata -> 3, confidence 0.5
+            {"command": "pb-commit", "confidence": 0.70},  # S -> 4
+            {"command": "pb-pr", "confidence": 0.80},  # S -> 4
+        ]
+
+        scored = analyzer._score_and_rank(recommendations, {})
+        assert [r["command"] for r in scored] == ["pb-pr", "pb-commit", "pb-unknown", "pb-cycle"]
+
     def test_confidence_range(self, metadata_file):
         """Test that confidence scores are in valid range."""
         analyzer = PlaybookContextAnalyzer(metadata_file=metadata_file)
@@ -518,5 +668,36 @@ class TestOutputFormatting:
         assert "**" in output or "`" in output  # Formatting
 
 
+class TestRealRepository:
+    """Run the analyzer against a real git repository."""
+
+    def _git(self, repo, *args):
+        subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+    def test_staged_only_change_is_not_reported_as_committed(
+        self, metadata_file, tmp_path, monkeypatch
+    ):
+        """A FINALIZE branch whose only change is staged must not claim all is committed."""
+        repo = tmp_path / "repo"
+        repo.mkdir()
+        self._git(repo, "init", "-q", "-b", "feature/x")
+        self._git(repo, "config", "user.email", "dev@example.com")
+        self._git(repo, "config", "user.name", "dev")
+        for n in range(5):
+            (repo / "app.py").write_text(f"VERSION = {n}\n")
+            self._git(repo, "add", "app.py")
+            self._git(repo, "commit", "-q", "-m", f"change {n}")
+        (repo / "app.py").write_text("VERSION = 5\n")
+        self._git(repo, "add", "app.py")
+        monkeypatch.chdir(repo)
+
+        analyzer = PlaybookContextAnalyzer(metadata_file=metadata_file)
+        git_state = analyzer._analyze_git_state()
+        output = analyzer.analyze()
+
+        assert git_state["staged_changes"] and not git_state["unstaged_changes"]
+        assert "Ready to create PR" not in output
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,37 @@
+"""Regression tests for cleanup-tags.py."""
+
+
+def test_strips_single_line_tags(tmp_path, load_script, make_command):
+    ct = load_script("cleanup-tags.py")
+    path = make_command(tmp_path, "pb-tagged", tags="['a', 'b']")
+
+    assert ct.cleanup_file(path) is True
+    assert "tags:" not in path.read_text()
+
+
+def test_untouched_file_is_not_rewritten(tmp_path, load_script, make_command):
+    """A file the regex leaves unchanged must not be written back.
+
+    Covers both a tag-free file and a multi-line tags array (which the
+    single-line pattern doesn't match): the mtime must not move.
+    """
+    ct = load_script("cleanup-tags.py")
+    plain = make_command(tmp_path, "pb-plain")
+    multiline = make_command(tmp_path, "pb-multi", tags="\n  - a\n  - b")
+
+    for path in (plain, multiline):
+        before = path.stat().st_mtime_ns
+        assert ct.cleanup_file(path) is False
+        assert path.stat().st_mtime_ns == before
+
+
+def test_iter_command_files_walks_subdirectories(tmp_path, load_script, make_command):
+    ct = load_script("cleanup-tags.py")
+    (tmp_path / "core").mkdir()
+    make_command(tmp_path, "pb-top")
+    make_command(tmp_path / "core", "pb-nested")
+    (tmp_path / "core" / "README.md").write_text("not a command\n")
+
+    found = sorted(ct.iter_command_files(str(tmp_path)))
+
+    assert found == [str(tmp_path / "core" / "pb-nested.md"), str(tmp_path / "pb-top.md")]
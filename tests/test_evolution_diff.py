@@ -1,5 +1,6 @@
-"""Regression test for evolution-diff.py report header."""
+"""Regression tests for evolution-diff.py."""
 import re
+import subprocess
 from datetime import datetime
 
 
@@ -16,3 +17,88 @@ def test_generated_field_is_timestamp(tmp_path, load_script):
     assert m, content
     # Must parse as an ISO timestamp; a cwd basename would raise here.
     datetime.fromisoformat(m.group(1).strip())
+
+
+def _git(repo, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=repo, check=True, capture_output=True,
+    )
+
+
+def test_changed_commands_across_commits(tmp_path, monkeypatch, load_script, make_command):
+    """Field-level changes come back per command; files added between commits
+    (no base version) and non-command files are skipped."""
+    cmds = tmp_path / "commands" / "core"
+    cmds.mkdir(parents=True)
+    _git(tmp_path, "init", "-q")
+    make_command(cmds, "pb-alpha")
+    make_command(cmds, "pb-beta")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-qm", "base")
+    make_command(cmds, "pb-alpha", version='"1.1.0"')
+    make_command(cmds, "pb-new")
+    (tmp_path / "README.md").write_text("readme\n")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-qm", "evolved")
+
+    monkeypatch.chdir(tmp_path)
+    ed = load_script("evolution-diff.py")
+    diff = ed.EvolutionDiff()
+    changes = diff.get_changed_commands("HEAD~1", "HEAD")
+
+    assert changes == {
+        "pb-alpha": {
+            "filepath": "commands/core/pb-alpha.md",
+            "fields": {"version": {"before": "1.0.0", "after": "1.1.0"}},
+        }
+    }
+    assert diff.group_by_field(changes) == {
+        "version": [("pb-alpha", {"before": "1.0.0", "after": "1.1.0"})]
+    }
+    # A result not produced by get_changed_commands is grouped on demand
+    assert diff.group_by_field(dict(changes)) == diff.group_by_field(changes)
+
+
+def test_field_grouping_follows_final_changes(tmp_path, monkeypatch, load_script, make_command):
+    """Two files declaring the same command name: the later one wins in the
+    result, and the field grouping lists only the change that survived."""
+    core, dev = tmp_path / "commands" / "core", tmp_path / "commands" / "dev"
+    core.mkdir(parents=True)
+    dev.mkdir()
+    _git(tmp_path, "init", "-q")
+    make_command(core, "pb-alpha")
+    make_command(dev, "pb-alpha")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-qm", "base")
+    make_command(core, "pb-alpha", version='"1.1.0"')
+    make_command(dev, "pb-alpha", version='"2.0.0"')
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-qm", "evolved")
+
+    monkeypatch.chdir(tmp_path)
+    ed = load_script("evolution-diff.py")
+    diff = ed.EvolutionDiff()
+    changes = diff.get_changed_commands("HEAD~1", "HEAD")
+
+    assert changes["pb-alpha"]["filepath"] == "commands/dev/pb-alpha.md"
+    assert diff.group_by_field(changes) == {
+        "version": [("pb-alpha", {"before": "1.0.0", "after": "2.0.0"})]
+    }
+
+
+def test_extract_metadata_parses_yaml_structures(load_script):
+    """Front-matter is real YAML: block lists and inline lists come back as
+    lists, quoted scalars lose their quotes."""
+    ed = load_script("evolution-diff.py")
+    content = (
+        '---\nname: "pb-x"\nrelated_commands:\n  - pb-a\n  - pb-b\n'
+        "breaking_changes: []\n---\nbody\n"
+    )
+
+    diff = ed.EvolutionDiff()
+    meta = diff.extract_metadata(content)
+
+    assert meta == {"name": "pb-x", "related_commands": ["pb-a", "pb-b"], "breaking_changes": []}
+    # Raw git output (bytes) parses the same
+    assert diff.extract_metadata(content.encode("utf-8")) == meta
@@ -1,12 +1,15 @@
-"""Regression tests for evolution-log.py main() exit codes and arg handling.
+"""Regression tests for evolution-log.py.
 
-Both bugs live in main()'s dispatch, so these drive the real entry point via
-subprocess in an isolated cwd (the audit log is a cwd-relative path).
+The main() exit-code and arg-handling bugs live in its dispatch, so those tests
+drive the real entry point via subprocess in an isolated cwd (the audit log is a
+cwd-relative path). Storage tests load the module and chdir into tmp_path.
 """
 import subprocess
 import sys
 from pathlib import Path
 
+import pytest
+
 REPO = Path(__file__).resolve().parent.parent
 SCRIPT = REPO / "scripts" / "evolution-log.py"
 
@@ -42,3 +45,219 @@ def test_empty_before_is_accepted(tmp_path):
         cwd=tmp_path,
     )
     assert "Missing required arguments" not in result.stdout, result.stdout
+
+
+def test_changes_journal_then_compact(tmp_path, monkeypatch, load_script):
+    """record_change appends to the JSONL journal without rewriting the base
+    log; a fresh load replays it, and completing the cycle folds it in."""
+    monkeypatch.chdir(tmp_path)
+    el = load_script("evolution-log.py")
+
+    log = el.EvolutionLog()
+    log.record_cycle("Q1", "manual", "")
+    base = log.log_file.read_bytes()
+    assert log.record_change("Q1", "pb-x", "version", "1.0.0", "1.1.0", "r")
+    assert log.record_change("Q1", "pb-y", "model_hint", "sonnet", "opus", "r")
+
+    assert log.log_file.read_bytes() == base
+    reloaded = el.EvolutionLog()
+    assert [c["command"] for c in reloaded.log["cycles"][0]["changes"]] == ["pb-x", "pb-y"]
+
+    reloaded.complete_cycle("Q1")
+    assert not reloaded.journal_file.exists()
+    assert len(el.EvolutionLog().log["cycles"][0]["changes"]) == 2
+
+
+def test_journal_replay_is_idempotent(tmp_path, monkeypatch, load_script):
+    """An entry already folded into the base (crash before the journal was
+    cleared) and a torn trailing line must not corrupt the replay."""
+    monkeypatch.chdir(tmp_path)
+    el = load_script("evolution-log.py")
+
+    log = el.EvolutionLog()
+    log.record_cycle("Q1", "manual", "")
+    log.record_change("Q1", "pb-x", "version", "1.0.0", "1.1.0", "r")
+    journal = log.journal_file.read_bytes()
+    log._save_log()  # base now holds the change
+    log.journal_file.write_bytes(journal + b'{"op": "change", "ind')
+
+    assert len(el.EvolutionLog().log["cycles"][0]["changes"]) == 1
+
+
+@pytest.mark.parametrize("use_orjson", [True, False], ids=["orjson", "stdlib"])
+def test_log_round_trips_with_either_json_backend(use_orjson, tmp_path, monkeypatch, load_script):
+    """Base log and journal written by one backend load back identically."""
+    import playbook_utils
+
+    if not use_orjson:
+        monkeypatch.setattr(playbook_utils, "orjson", None)
+    elif playbook_utils.orjson is None:
+        pytest.skip("orjson not installed")
+    monkeypatch.chdir(tmp_path)
+    el = load_script("evolution-log.py")
+
+    log = el.EvolutionLog()
+    log.record_cycle("Q1", "manual", "caf\u00e9")
+    log.record_change("Q1", "pb-x", "version", "1.0.0", "1.1.0", "r")
+
+    assert el.EvolutionLog().log == log.log
+
+
+def test_batch_coalesces_writes(tmp_path, monkeypatch, load_script):
+    """Mutations inside batch() save once on exit and journal nothing."""
+    monkeypatch.chdir(tmp_path)
+    el = load_script("evolution-log.py")
+
+    log = el.EvolutionLog()
+    saves = []
+    real_save = log._save_log
+    monkeypatch.setattr(log, "_save_log", lambda: saves.append(1) or real_save())
+    with log.batch():
+        log.record_cycle("Q1", "manual", "")
+        for i in range(5):
+            log.record_change("Q1", f"pb-{i}", "version", "1.0.0", "1.1.0", "r")
+        log.set_cycle_snapshot("Q1", "snap")
+
+    assert saves == [1]
+    assert not log.journal_file.exists()
+    cycle = el.EvolutionLog().log["cycles"][0]
+    assert len(cycle["changes"]) == 5 and cycle["snapshot_id"] == "snap"
+
+
+def test_read_only_commands_write_nothing(tmp_path, monkeypatch, load_script):
+    """Loading, --show and --analyze leave todos/ exactly as they found it."""
+    monkeypatch.chdir(tmp_path)
+    el = load_script("evolution-log.py")
+    log = el.EvolutionLog()
+    log.record_cycle("Q1", "manual", "")
+    log.record_change("Q1", "pb-a", "model_hint", "sonnet", "opus", "r")
+
+    todos = tmp_path / "todos"
+    before = {p.name: p.stat().st_mtime_ns for p in todos.iterdir()}
+    reader = el.EvolutionLog()
+    reader.show_history()
+    reader.analyze_patterns()
+
+    assert {p.name: p.stat().st_mtime_ns for p in todos.iterdir()} == before
+
+
+def test_reused_cycle_name_targets_latest(tmp_path, monkeypatch, load_script):
+    """Re-running a reverted cycle under the same name records into the new one."""
+    monkeypatch.chdir(tmp_path)
+    el = load_script("evolution-log.py")
+
+    log = el.EvolutionLog()
+    log.record_cycle("Q1", "manual", "")
+    log.revert_cycle("Q1", "broke things")
+    assert not log.record_change("Q1", "pb-x", "version", "1.0.0", "1.1.0", "r")
+
+    log.record_cycle("Q1", "manual", "")
+    assert log.record_change("Q1", "pb-x", "version", "1.0.0", "1.1.0", "r")
+    cycles = el.EvolutionLog().log["cycles"]
+    assert [len(c["changes"]) for c in cycles] == [0, 1]
+
+
+def test_aggregates_track_changes(tmp_path, monkeypatch, load_script):
+    """Incremental aggregates, including journal replay, equal a full recount."""
+    monkeypatch.chdir(tmp_path)
+    el = load_script("evolution-log.py")
+
+    log = el.EvolutionLog()
+    log.record_cycle("Q1", "quarterly", "")
+    log.record_change("Q1", "pb-a", "model_hint", "sonnet", "opus", "r")
+    log.record_change("Q1", "pb-b", "model_hint", "sonnet", "opus", "r")
+    log.record_change("Q1", "pb-c", "version", "1.0", "1.1", "r")
+
+    reloaded = el.EvolutionLog()  # base aggregates plus replayed journal
+    incremental = reloaded.log["_aggregates"]
+    reloaded._rebuild_aggregates()
+    assert incremental == reloaded.log["_aggregates"]
+    assert incremental["field_transitions"]["model_hint"] == {"sonnet → opus": 2}
+    assert incremental["triggers"] == {"quarterly": 1}
+
+
+def test_stale_aggregates_are_recounted(tmp_path, monkeypatch, load_script):
+    """A hand edit of the JSON (here: dropping a cycle) invalidates the counts."""
+    import json
+
+    monkeypatch.chdir(tmp_path)
+    el = load_script("evolution-log.py")
+    log = el.EvolutionLog()
+    log.record_cycle("Q1", "quarterly", "")
+    log.record_change("Q1", "pb-a", "model_hint", "sonnet", "opus", "r")
+    log.record_cycle("Q2", "manual", "")
+    log.record_change("Q2", "pb-b", "version", "1.0", "1.1", "r")
+    log.complete_cycle("Q2")
+
+    data = json.loads(log.log_file.read_text())
+    assert "cycles_digest" in data["_aggregates"]
+    del data["cycles"][1]
+    log.log_file.write_text(json.dumps(data))
+
+    aggregates = el.EvolutionLog().log["_aggregates"]
+    assert aggregates["triggers"] == {"quarterly": 1}
+    assert aggregates["field_changes"] == {"model_hint": 1}
+
+
+def test_failed_save_keeps_previous_log(tmp_path, monkeypatch, load_script):
+    """A save that dies before the rename leaves the old log and no temp file."""
+    import playbook_utils
+
+    monkeypatch.chdir(tmp_path)
+    el = load_script("evolution-log.py")
+    log = el.EvolutionLog()
+    log.record_cycle("Q1", "manual", "")
+    before = log.log_file.read_bytes()
+
+    def crash(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(playbook_utils.os, "replace", crash)
+    with pytest.raises(OSError):
+        log.complete_cycle("Q1")
+    assert log.log_file.read_bytes() == before
+    assert list(log.log_file.parent.glob("*.tmp")) == []
+
+
+def test_empty_log_file_starts_fresh(tmp_path, monkeypatch, load_script):
+    """A zero-byte audit file (e.g. touched by hand) loads as an empty log."""
+    monkeypatch.chdir(tmp_path)
+    el = load_script("evolution-log.py")
+    (tmp_path / "todos").mkdir()
+    (tmp_path / "todos" / "evolution-audit.json").write_bytes(b"")
+
+    assert el.EvolutionLog().log["cycles"] == []
+
+
+def test_export_timeline(tmp_path, monkeypatch, load_script):
+    """The exported timeline is indented JSON, one entry per cycle."""
+    import json
+
+    monkeypatch.chdir(tmp_path)
+    el = load_script("evolution-log.py")
+    log = el.EvolutionLog()
+    log.record_cycle("Q1", "manual", "")
+    log.record_change("Q1", "pb-x", "version", "1.0.0", "1.1.0", "r")
+
+    out = tmp_path / "timeline.json"
+    log.export_timeline(str(out))
+    assert json.loads(out.read_text()) == [{
+        "cycle": "Q1",
+        "date": log.log["cycles"][0]["started_at"],
+        "changes": 1,
+        "status": "in_progress",
+    }]
+    assert out.read_text().startswith("[\n  {")
+
+
+def test_cycles_do_not_share_change_lists(tmp_path, monkeypatch, load_script):
+    """Cycles built from the template each get their own changes list."""
+    monkeypatch.chdir(tmp_path)
+    el = load_script("evolution-log.py")
+    log = el.EvolutionLog()
+    first = log.record_cycle("Q1", "manual", "")
+    second = log.record_cycle("Q2", "manual", "")
+    log.record_change("Q2", "pb-x", "version", "1.0.0", "1.1.0", "r")
+
+    assert first["changes"] == [] and len(second["changes"]) == 1
+    assert list(first) == list(el.EvolutionLog._CYCLE_TEMPLATE)
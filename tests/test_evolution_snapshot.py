@@ -11,7 +11,8 @@ SCRIPT = REPO / "scripts" / "evolution-snapshot.py"
 
 def test_list_runs_on_fresh_checkout(tmp_path):
     """#9: --list must work in a tree with no todos/ (a fresh clone -- todos/ is
-    gitignored). The constructor used to mkdir without parents=True and crash."""
+    gitignored). The constructor used to mkdir without parents=True and crash;
+    now it creates nothing at all until a snapshot is saved."""
     result = subprocess.run(
         [sys.executable, str(SCRIPT), "--list"],
         cwd=tmp_path,
@@ -19,7 +20,18 @@ def test_list_runs_on_fresh_checkout(tmp_path):
         text=True,
     )
     assert result.returncode == 0, result.stderr
-    assert (tmp_path / "todos" / "evolution-snapshots").is_dir()
+    assert not (tmp_path / "todos").exists()
+
+
+def test_first_save_creates_snapshot_dir(tmp_path, monkeypatch, load_script):
+    """The deferred mkdir still builds todos/evolution-snapshots/ on save."""
+    monkeypatch.chdir(tmp_path)
+    es = load_script("evolution-snapshot.py")
+    snap = es.EvolutionSnapshot()
+    snap.snapshots["evolution-1"] = {"message": "m", "status": "active"}
+    snap._save_snapshots()
+
+    assert es.EvolutionSnapshot().snapshots == snap.snapshots
 
 
 def test_cleanup_is_dispatched(tmp_path, monkeypatch, load_script):
@@ -39,3 +51,27 @@ def test_cleanup_is_dispatched(tmp_path, monkeypatch, load_script):
         es.main()
     assert exc.value.code == 0
     assert calls == [3]
+
+
+def _git(cwd, *args):
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+@pytest.mark.parametrize("layout", ["loose", "packed", "detached"])
+def test_read_head_matches_git(layout, tmp_path, monkeypatch, load_script):
+    """HEAD is read from .git directly and must agree with git rev-parse."""
+    _git(tmp_path, "init", "-q", "-b", "feature/x")
+    _git(tmp_path, "-c", "user.name=t", "-c", "user.email=t@t",
+         "commit", "-q", "--allow-empty", "-m", "init")
+    if layout == "packed":
+        _git(tmp_path, "pack-refs", "--all")
+    elif layout == "detached":
+        _git(tmp_path, "checkout", "-q", "--detach")
+    monkeypatch.chdir(tmp_path)
+    es = load_script("evolution-snapshot.py")
+
+    expected = (_git(tmp_path, "rev-parse", "HEAD"),
+                _git(tmp_path, "rev-parse", "--abbrev-ref", "HEAD"))
+    assert es.EvolutionSnapshot()._read_head() == expected
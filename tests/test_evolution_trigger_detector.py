@@ -37,3 +37,109 @@ def test_version_check_does_not_guess(tmp_path, monkeypatch, load_script):
     det = load_script("evolution-trigger-detector.py")
     detector = det.EvolutionTriggerDetector()
     assert detector.check_claude_version_change() is None
+
+
+def test_calendar_check_reads_utc_and_naive_timestamps(tmp_path, monkeypatch, load_script):
+    """evolution-log now writes UTC-aware started_at; older logs are naive.
+    Both must compare against "now" without a naive/aware TypeError."""
+    monkeypatch.chdir(tmp_path)
+    el = load_script("evolution-log.py")
+    el.EvolutionLog().record_cycle("Q1", "manual", "")
+
+    det = load_script("evolution-trigger-detector.py")
+    detector = det.EvolutionTriggerDetector()
+    assert detector.check_time_since_last_evolution() is None
+
+    log = el.EvolutionLog()
+    log.log["cycles"][0]["started_at"] = "2020-01-01T00:00:00"
+    log._save_log()
+    assert detector.check_time_since_last_evolution()["type"] == "calendar_trigger"
+
+
+def test_staleness_finds_date_past_the_read_window(tmp_path, load_script, make_command):
+    """Only the head of each file is read first; a last_reviewed line beyond it
+    must still be found rather than silently skipped."""
+    commands = tmp_path / "commands" / "development"
+    commands.mkdir(parents=True)
+    det = load_script("evolution-trigger-detector.py")
+    padding = "x" * det.HEAD_BYTES
+    (commands / "pb-long.md").write_text(f"# pb-long\n\n{padding}\nlast_reviewed: 2020-01-01\n")
+
+    detector = det.EvolutionTriggerDetector()
+    detector.commands_dir = tmp_path / "commands"
+    result = detector.check_command_staleness()
+    assert result is not None and result["stale_count"] == 1
+
+
+def test_markdown_report_written_whole(tmp_path, load_script):
+    """The report is rendered in memory and written once, with or without triggers."""
+    det = load_script("evolution-trigger-detector.py")
+    detector = det.EvolutionTriggerDetector()
+    out = tmp_path / "report.md"
+
+    detector.generate_markdown_report([], str(out))
+    assert out.read_text().endswith("✅ No evolution triggers detected.\n\n")
+
+    trigger = {"type": "staleness_trigger", "severity": "medium", "message": "m",
+               "stale_commands": [{"command": "pb-a", "days_stale": 200}]}
+    detector.generate_markdown_report([trigger], str(out))
+    text = out.read_text()
+    assert "### staleness_trigger (medium)" in text
+    assert "- `pb-a`: last reviewed 200 days ago" in text
+    assert text.endswith("`docs/evolution-operational-guide.md`\n")
+
+
+def test_calendar_check_reuses_parsed_log(tmp_path, monkeypatch, load_script):
+    """Repeat checks parse the audit log once; rewriting it is picked up."""
+    monkeypatch.chdir(tmp_path)
+    el = load_script("evolution-log.py")
+    el.EvolutionLog().record_cycle("Q1", "manual", "")
+
+    det = load_script("evolution-trigger-detector.py")
+    detector = det.EvolutionTriggerDetector()
+    parses = []
+    real_loads = det.json_loads
+    monkeypatch.setattr(det, "json_loads", lambda data: parses.append(1) or real_loads(data))
+
+    assert detector.check_time_since_last_evolution() is None
+    assert det.EvolutionTriggerDetector().check_time_since_last_evolution() is None
+    assert len(parses) == 1
+
+    log = el.EvolutionLog()
+    log.log["cycles"][0]["started_at"] = "2020-01-01T00:00:00"
+    log._save_log()
+    assert detector.check_time_since_last_evolution()["type"] == "calendar_trigger"
+    assert len(parses) == 2
+
+
+def test_staleness_stops_once_trigger_is_impossible(tmp_path, monkeypatch, load_script,
+                                                    make_command):
+    """With 8 fresh commands the 25% bar (2) is out of reach after 6 reads."""
+    commands = tmp_path / "commands" / "development"
+    commands.mkdir(parents=True)
+    for n in range(8):
+        make_command(commands, f"pb-{n}", last_reviewed='"2999-01-01"')
+
+    det = load_script("evolution-trigger-detector.py")
+    opened = []
+    monkeypatch.setattr(det, "open", lambda *a, **k: opened.append(a[0]) or open(*a, **k),
+                        raising=False)
+    detector = det.EvolutionTriggerDetector()
+    detector.commands_dir = tmp_path / "commands"
+    assert detector.check_command_staleness() is None
+    assert len(opened) == 6
+
+
+def test_feedback_counts_only_non_empty_feedback_files(tmp_path, monkeypatch, load_script):
+    """todos/ is scanned once; only non-empty *feedback* entries count."""
+    monkeypatch.chdir(tmp_path)
+    det = load_script("evolution-trigger-detector.py")
+    detector = det.EvolutionTriggerDetector()
+    assert detector.check_git_log_for_user_feedback() is None  # no todos/
+
+    todos = tmp_path / "todos"
+    todos.mkdir()
+    (todos / "user-feedback.md").write_text("gap in pb-ship\n")
+    (todos / "feedback-empty.md").write_text("")
+    (todos / "notes.md").write_text("not feedback\n")
+    assert detector.check_git_log_for_user_feedback()["feedback_items"] == 1
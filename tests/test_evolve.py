@@ -28,3 +28,227 @@ def test_validate_tolerates_yaml_native_date_and_bad_related(
     str_issues = issues["pb-str-related.md"]
     assert any("must be a list" in i for i in str_issues)
     assert not any("CIRCULAR" in i for i in str_issues)
+
+
+def test_load_all_commands_scans_once(tmp_path, load_script, make_command):
+    """--all calls load_all_commands from analyze, --validate and --generate;
+    only the first may touch disk, or parse warnings/errors get duplicated."""
+    commands = tmp_path / "commands" / "development"
+    commands.mkdir(parents=True)
+    make_command(commands, "pb-a")
+
+    evolve = load_script("evolve.py")
+    engine = evolve.PlaybookEvolutionEngine(root_dir=str(tmp_path))
+    calls = []
+    discover = engine.discover_commands
+    engine.discover_commands = lambda: calls.append(1) or discover()
+
+    engine.analyze()
+    engine.load_all_commands()
+    engine.load_all_commands()
+    assert calls == [1]
+    assert list(engine.commands) == ["pb-a.md"]
+    # Only metadata is kept in memory; the file text is read on demand
+    assert set(engine.commands["pb-a.md"]) == {"path", "metadata", "has_metadata"}
+    assert engine.get_content("pb-a.md").startswith("---\nname:")
+
+
+def test_extract_metadata_reads_front_matter_only(tmp_path, load_script):
+    """Only the leading --- block is parsed (CRLF too); no block, or an
+    unterminated one, means no metadata."""
+    evolve = load_script("evolve.py")
+    engine = evolve.PlaybookEvolutionEngine(root_dir=str(tmp_path))
+    cases = {
+        "lf": b"---\nname: pb-lf\n---\n# Body\n\n---\nname: not-this\n---\n",
+        "crlf": b"---\r\nname: pb-crlf\r\n---\r\n# Body\r\n",
+        "none": b"# Body\n---\nname: x\n---\n",
+        "open": b"---\nname: pb-open\n",
+    }
+    results = {}
+    for key, data in cases.items():
+        path = tmp_path / f"pb-{key}.md"
+        path.write_bytes(data)
+        results[key] = engine.extract_metadata(path)[0]
+
+    assert results == {
+        "lf": {"name": "pb-lf"}, "crlf": {"name": "pb-crlf"}, "none": None, "open": None,
+    }
+
+
+def test_parallel_load_keeps_error_order(tmp_path, load_script):
+    """Files are parsed concurrently, but errors are reported in path order."""
+    commands = tmp_path / "commands" / "development"
+    commands.mkdir(parents=True)
+    for i in range(20):
+        (commands / f"pb-{i:02d}.md").write_text("---\nname: [broken\n---\n")
+
+    evolve = load_script("evolve.py")
+    engine = evolve.PlaybookEvolutionEngine(root_dir=str(tmp_path))
+    engine.load_all_commands()
+
+    assert [e.split(":")[0] for e in engine.errors] == [f"pb-{i:02d}.md" for i in range(20)]
+    assert len(engine.commands) == 20
+
+
+def test_parse_cache_skips_unchanged_files(tmp_path, load_script, make_command):
+    """A second run reuses cached parses for unchanged files and re-parses
+    only the edited one, reporting the same metadata either way."""
+    commands = tmp_path / "commands" / "development"
+    commands.mkdir(parents=True)
+    make_command(commands, "pb-a")
+    edited = make_command(commands, "pb-b")
+
+    evolve = load_script("evolve.py")
+    first = evolve.PlaybookEvolutionEngine(root_dir=str(tmp_path))
+    first.analyze()
+    assert first.cache_file.exists()
+
+    edited.write_text(edited.read_text().replace('name: "pb-b"', 'name: "pb-b-renamed"'))
+    second = evolve.PlaybookEvolutionEngine(root_dir=str(tmp_path))
+    parsed = []
+    parse = second._parse_command
+    second._parse_command = lambda path: parsed.append(path.name) or parse(path)
+    second.load_all_commands()
+
+    assert parsed == ["pb-b.md"]
+    assert second.commands["pb-a.md"]["metadata"] == first.commands["pb-a.md"]["metadata"]
+    assert second.commands["pb-b.md"]["metadata"]["name"] == "pb-b-renamed"
+
+
+def test_parse_cache_is_json_and_versioned(tmp_path, load_script, make_command):
+    """Cached parses round-trip YAML dates, and a cache written by another
+    parser version (or anything unreadable) is ignored rather than trusted."""
+    import datetime
+    import json
+
+    import pytest
+
+    commands = tmp_path / "commands" / "development"
+    commands.mkdir(parents=True)
+    make_command(commands, "pb-a", last_reviewed="2026-06-10")  # unquoted: a date
+
+    evolve = load_script("evolve.py")
+    first = evolve.PlaybookEvolutionEngine(root_dir=str(tmp_path))
+    first.analyze()
+    data = json.loads(first.cache_file.read_text())
+    assert data["key"] == first._cache_key()
+
+    second = evolve.PlaybookEvolutionEngine(root_dir=str(tmp_path))
+    second._parse_command = lambda path: pytest.fail("re-parsed a cached file")
+    second.load_all_commands()
+    assert second.commands["pb-a.md"]["metadata"]["last_reviewed"] == datetime.date(2026, 6, 10)
+
+    data["key"][0] = evolve.CACHE_VERSION - 1
+    first.cache_file.write_text(json.dumps(data))
+    assert evolve.PlaybookEvolutionEngine(root_dir=str(tmp_path))._load_cache() == {}
+    first.cache_file.write_bytes(b"\x80\x04not json")
+    assert evolve.PlaybookEvolutionEngine(root_dir=str(tmp_path))._load_cache() == {}
+
+
+def test_cache_encoding_rejects_lossy_values(load_script):
+    """Values JSON can't round-trip raise, so their entry is left uncached."""
+    import datetime
+
+    import pytest
+
+    evolve = load_script("evolve.py")
+    when = datetime.datetime(2026, 6, 10, 12, 30, tzinfo=datetime.timezone.utc)
+    value = {"when": when, "day": when.date(), "tags": ["a"], "n": None}
+    assert evolve._from_json(evolve._to_json(value)) == value
+    for lossy in ({1: "int key"}, {"$date": "x"}, {"s": {1, 2}}, b"raw", float("nan"), 2**70):
+        with pytest.raises(TypeError):
+            evolve._to_json(lossy)
+
+
+def test_last_reviewed_accepts_what_strptime_did(tmp_path, load_script, make_command):
+    """Unpadded dates still pass; other ISO 8601 shapes fromisoformat would
+    accept, and impossible days, still fail validation."""
+    commands = tmp_path / "commands" / "development"
+    commands.mkdir(parents=True)
+    make_command(commands, "pb-basic", last_reviewed='"20260610"')
+    make_command(commands, "pb-week", last_reviewed='"2026-W23-1"')
+    make_command(commands, "pb-ok", last_reviewed='"2026-06-10"')
+    make_command(commands, "pb-unpadded", last_reviewed='"2026-1-5"')
+    make_command(commands, "pb-feb", last_reviewed='"2026-02-30"')
+
+    evolve = load_script("evolve.py")
+    engine = evolve.PlaybookEvolutionEngine(root_dir=str(tmp_path))
+    engine.load_all_commands()
+    issues = engine.validate_metadata()
+
+    bad = "INVALID: last_reviewed date format (use YYYY-MM-DD)"
+    assert bad in issues["pb-basic.md"] and bad in issues["pb-week.md"]
+    assert bad in issues["pb-feb.md"]
+    assert bad not in issues["pb-ok.md"] and bad not in issues["pb-unpadded.md"]
+
+
+def test_unhashable_enum_values_are_reported(tmp_path, load_script, make_command):
+    """A list where a scalar belongs is INVALID, not a crash in the set lookup."""
+    commands = tmp_path / "commands" / "development"
+    commands.mkdir(parents=True)
+    make_command(commands, "pb-list", category="[core]", model_hint="{a: 1}")
+
+    evolve = load_script("evolve.py")
+    engine = evolve.PlaybookEvolutionEngine(root_dir=str(tmp_path))
+    engine.load_all_commands()
+    issues = engine.validate_metadata()["pb-list.md"]
+
+    assert any(i.startswith("INVALID: category=") for i in issues)
+    assert any(i.startswith("INVALID: model_hint=") for i in issues)
+
+
+def test_save_analysis_round_trips(tmp_path, load_script, make_command):
+    """The analysis file is indented JSON that loads back to the same report."""
+    import json
+
+    commands = tmp_path / "commands" / "development"
+    commands.mkdir(parents=True)
+    make_command(commands, "pb-a", category='"nope"')
+
+    evolve = load_script("evolve.py")
+    engine = evolve.PlaybookEvolutionEngine(root_dir=str(tmp_path))
+    analysis = engine.analyze()
+    out = tmp_path / "todos" / "evolution-analysis.json"
+    engine.save_analysis(analysis, str(out))
+
+    assert json.loads(out.read_text()) == json.loads(json.dumps(analysis))
+    assert out.read_text().startswith('{\n  "timestamp"')
+
+
+def test_single_pass_scan_matches_separate_methods(tmp_path, load_script, make_command):
+    """analyze()'s fused scan reports what the three standalone methods do."""
+    commands = tmp_path / "commands" / "development"
+    commands.mkdir(parents=True)
+    make_command(commands, "pb-a")
+    make_command(commands, "pb-b", model_hint='"opus"', category='"nope"')
+    (commands / "pb-bare.md").write_text("# No front-matter\n")
+
+    evolve = load_script("evolve.py")
+    engine = evolve.PlaybookEvolutionEngine(root_dir=str(tmp_path))
+    analysis = engine.analyze()
+
+    assert analysis["issues_by_file"] == engine.validate_metadata()
+    assert analysis["model_distribution"] == engine.generate_model_distribution()
+    assert analysis["category_breakdown"] == engine.generate_category_breakdown()
+
+
+def test_simple_front_matter_matches_yaml(tmp_path, load_script, make_command):
+    """The regex fast path must agree with PyYAML on what it accepts, and defer
+    anything YAML could read differently (bare scalars, bool-ish keys, tabs)."""
+    import pytest
+
+    yaml = pytest.importorskip("yaml")
+    commands = tmp_path / "commands" / "development"
+    commands.mkdir(parents=True)
+    path = make_command(commands, "pb-a", related_commands='["pb-b", \'pb-c\']')
+
+    evolve = load_script("evolve.py")
+    engine = evolve.PlaybookEvolutionEngine(root_dir=str(tmp_path))
+    front_matter = engine._read_front_matter(path)
+    parsed = evolve._parse_simple_front_matter(front_matter)
+    assert parsed is not None
+    assert parsed == yaml.safe_load(front_matter)
+
+    for text in ('a: 2026-06-10', 'a: yes', 'on: "x"', 'a:\t"x"', "a: 'it''s'",
+                 'a: "x" # note', 'a:\n  - "x"', 'a: "\\n"'):
+        assert evolve._parse_simple_front_matter(text) is None, text
@@ -0,0 +1,146 @@
+"""Regression tests for extract-playbook-metadata.py."""
+from pathlib import Path
+
+
+def test_tier_reads_extra_small(load_script):
+    """XS used to be matched one letter at a time and dropped. Both the explicit
+    marker and tier-table rows must report it, and a list keeps every item."""
+    ex = load_script("extract-playbook-metadata.py")
+    extractor = ex.PlaybookMetadataExtractor(repo_root=Path("."))
+
+    assert extractor._extract_tier("Tier: XS\n") == ["XS"]
+    assert extractor._extract_tier("Tier: [XS, M, L]\n") == ["XS", "M", "L"]
+    assert extractor._extract_tier("| **XS** | one-line fix |\n") == ["XS"]
+    assert extractor._extract_tier("No tier here.\n") is None
+
+
+def test_tier_keywords_found_in_one_pass(load_script):
+    ex = load_script("extract-playbook-metadata.py")
+    extractor = ex.PlaybookMetadataExtractor(repo_root=Path("."))
+
+    assert extractor._extract_tier("A SIMPLE, standard fix\n") == ["XS", "M"]
+    assert extractor._extract_tier("Complex. Trivial. Moderate.\n") == ["XS", "M", "L"]
+    # A word starting with a tier letter is a keyword, not an explicit marker
+    assert extractor._extract_tier("Tier: Simple\n") == ["XS"]
+    assert extractor._extract_tier("Tier: Large\n") == ["L"]
+    # Keywords are matched on lowercased text, so any casing counts
+    assert extractor._extract_tier("SIMPLE\n") == ["XS"]
+    assert extractor._extract_tier("A Moderate, COMPLEX change\n") == ["M", "L"]
+    assert extractor._extract_tier("StraightForward\n") == ["XS"]
+
+
+def test_decision_rules_match_any_case(load_script):
+    """"use" and "/pb-" match in any case; captures keep the original text."""
+    ex = load_script("extract-playbook-metadata.py")
+    extractor = ex.PlaybookMetadataExtractor(repo_root=Path("."))
+    content = "New Feature? → USE /PB-Start\nBug → use /pb-debug\nDocs → Use/pb-x\n"
+
+    assert extractor._extract_decision_context(content) == {
+        "New Feature?": "/PB-Start",
+        "Bug": "/pb-debug",
+    }
+
+
+def test_sections_split_once_and_shared(load_script):
+    """Extractors read their section from one split; h3 headings count and a
+    body stops at the next '##', as the per-section regexes behaved."""
+    ex = load_script("extract-playbook-metadata.py")
+    extractor = ex.PlaybookMetadataExtractor(repo_root=Path("."))
+    content = (
+        "# pb-x\n\n## When to Use\n\nDaily standups. Use when: starting work\n\n"
+        "### Next Steps\n\n/pb-b then /pb-a then /pb-b\n\n## Notes\n\n/pb-z\n"
+    )
+    sections = extractor._split_sections(content)
+
+    assert [heading for heading, _, _ in sections] == ["when to use", "next steps", "notes"]
+    assert extractor._extract_next_steps(content, sections) == ["/pb-b", "/pb-a"]
+    assert extractor._extract_prerequisites(content, sections) is None
+    assert extractor._extract_frequency(content, sections) == "daily"
+    assert extractor._extract_decision_context(content) == {"use_when_0": "starting work"}
+
+
+def test_pb_refs_scanned_once_and_bucketed_by_section(load_script):
+    """One scan of /pb-* refs serves related_commands and every section lookup."""
+    ex = load_script("extract-playbook-metadata.py")
+    extractor = ex.PlaybookMetadataExtractor(repo_root=Path("."))
+    content = "See /pb-z.\n\n## Prerequisites\n\n/pb-y, /pb-x\n\n## Next Steps\n\n/pb-w\n"
+    sections = extractor._split_sections(content)
+    pb_refs = extractor._find_pb_refs(content)
+
+    assert pb_refs[1] == ["/pb-z", "/pb-y", "/pb-x", "/pb-w"]
+    assert extractor._extract_related_commands(content, pb_refs) == [
+        "/pb-w", "/pb-x", "/pb-y", "/pb-z"
+    ]
+    assert extractor._extract_prerequisites(content, sections, pb_refs) == ["/pb-y", "/pb-x"]
+    assert extractor._extract_next_steps(content, sections, pb_refs) == ["/pb-w"]
+
+
+def test_each_command_file_is_read_once(tmp_path, load_script, make_command):
+    """Discovery reads every file (to spot skills); extraction reuses that text."""
+    commands = tmp_path / "commands" / "development"
+    commands.mkdir(parents=True)
+    make_command(commands, "pb-a")
+    make_command(commands, "pb-b")
+    (commands / "pb-skill.md").write_text("You are a reviewer.\n")
+
+    ex = load_script("extract-playbook-metadata.py")
+    extractor = ex.PlaybookMetadataExtractor(repo_root=tmp_path)
+    reads = []
+    real_read = extractor._read_file
+    extractor._read_file = lambda path: reads.append(path.name) or real_read(path)
+
+    result = extractor.extract_all()
+
+    assert sorted(result["commands"]) == ["pb-a", "pb-b"]
+    assert sorted(reads) == ["pb-a.md", "pb-b.md", "pb-skill.md"]
+
+
+def test_skill_detection_reads_first_line_only(load_script):
+    ex = load_script("extract-playbook-metadata.py")
+
+    assert ex.is_skill_file("You are a reviewer.\n\n# Body\n")
+    assert ex.is_skill_file("  Lets begin\n")
+    assert not ex.is_skill_file("You are\n")  # indicator needs a following word
+    assert not ex.is_skill_file("# pb-x\n\nYou are a reviewer.\n")
+    assert not ex.is_skill_file("")
+
+
+def test_one_extraction_timestamp_per_run(tmp_path, load_script, make_command):
+    commands = tmp_path / "commands" / "development"
+    commands.mkdir(parents=True)
+    make_command(commands, "pb-a")
+    make_command(commands, "pb-b")
+
+    ex = load_script("extract-playbook-metadata.py")
+    result = ex.PlaybookMetadataExtractor(repo_root=tmp_path).extract_all()
+
+    stamps = {c["extraction_metadata"]["extraction_date"] for c in result["commands"].values()}
+    assert stamps == {result["extraction_date"]}
+
+
+def test_save_metadata_round_trips(tmp_path, load_script, make_command):
+    import json
+
+    commands = tmp_path / "commands" / "development"
+    commands.mkdir(parents=True)
+    make_command(commands, "pb-a")
+
+    ex = load_script("extract-playbook-metadata.py")
+    extractor = ex.PlaybookMetadataExtractor(repo_root=tmp_path)
+    result = extractor.extract_all()
+    out = tmp_path / ".playbook-metadata.json"
+    extractor.save_metadata(out)
+
+    assert json.loads(out.read_text()) == json.loads(json.dumps(result))
+    assert out.read_text().startswith('{\n  "metadata_version"')
+
+
+def test_examples_and_checklist_flags(load_script):
+    ex = load_script("extract-playbook-metadata.py")
+    extractor = ex.PlaybookMetadataExtractor(repo_root=Path("."))
+
+    assert extractor._extract_has_examples("```bash\nls\n```\n")
+    assert not extractor._extract_has_examples("`inline` only\n")
+    assert extractor._extract_has_checklist("- [ ] ship it\n")
+    assert extractor._extract_has_checklist("- [] ship it\n")
+    assert not extractor._extract_has_checklist("- [x] done, see [link](url)\n")
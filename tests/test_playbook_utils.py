@@ -0,0 +1,43 @@
+"""Regression tests for playbook_utils.py."""
+import json
+
+import pytest
+
+import playbook_utils
+
+SAMPLE = {
+    "message": "Évolution → naïve café 日本語 🚀",
+    "tags": ["über", "ascii"],
+    "nested": {"n": None, "ok": True, "count": 3, "empty": [], "map": {}},
+}
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(playbook_utils, "orjson", None)
+    elif playbook_utils.orjson is None:
+        pytest.skip("orjson not installed")
+    return request.param
+
+
+@pytest.mark.parametrize("indent", [True, False], ids=["indented", "compact"])
+def test_json_dumps_round_trips_non_ascii(backend, indent):
+    """Non-ASCII text is written as raw UTF-8 (no \\u escapes) and reads back."""
+    data = playbook_utils.json_dumps(SAMPLE, indent=indent)
+
+    assert "Évolution → naïve café 日本語 🚀".encode("utf-8") in data
+    assert b"\\u" not in data
+    assert playbook_utils.json_loads(data) == SAMPLE
+    assert json.loads(data) == SAMPLE
+
+
+@pytest.mark.parametrize("indent", [True, False], ids=["indented", "compact"])
+def test_json_dumps_backends_write_identical_bytes(indent, monkeypatch):
+    """A file's bytes don't depend on whether orjson is installed."""
+    if playbook_utils.orjson is None:
+        pytest.skip("orjson not installed")
+    fast = playbook_utils.json_dumps(SAMPLE, indent=indent)
+    monkeypatch.setattr(playbook_utils, "orjson", None)
+
+    assert playbook_utils.json_dumps(SAMPLE, indent=indent) == fast